@@ -1 +1,4 @@
-from .ptt_crawler import AioPTTCrawler
\ No newline at end of file
+from .cache import ResponseCache
+from .metrics import CrawlMetrics
+from .ptt_crawler import AioPTTCrawler
+from .sink import JSONLSink, ParquetSink, SQLiteSink, Sink
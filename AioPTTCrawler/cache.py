@@ -0,0 +1,134 @@
+import re
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    body: str
+    etag: str
+    last_modified: str
+    stored_time: float
+
+
+class ResponseCache:
+    # article page url, other pages (board's index) are always revalidated
+    ARTICLE_URL_PATTERN: re.Pattern = re.compile(r"/M\.\d+\.A\.[0-9A-Za-z]+\.html$")
+    # run eviction once every amount of insertions
+    EVICT_INTERVAL: int = 100
+
+    # initial ResponseCache
+    def __init__(
+        self,
+        path: str,
+        fresh_time: float = 0,
+        max_age: float = None,
+        max_size: int = None,
+        offline: bool = False,
+    ) -> None:
+        """
+        On-disk HTTP response cache stored in SQLite with zlib compressed bodies.
+        Stale responses are revalidated with If-None-Match / If-Modified-Since.
+
+        Parameters:
+        path (str): SQLite file path
+        fresh_time (float): seconds an article page is served without revalidation
+        max_age (float): seconds after which entries are evicted, never if None
+        max_size (int): total compressed bytes kept, least recently used entries are evicted first, unlimited if None
+        offline (bool): replay mode, serve everything from cache and never send requests
+
+        Returns:
+        None
+        """
+        self.path = path
+        self.fresh_time = fresh_time
+        self.max_age = max_age
+        self.max_size = max_size
+        self.offline = offline
+        self.__insert_count = 0
+        self.__connection = sqlite3.connect(path, isolation_level=None)
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS response_cache (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_time REAL NOT NULL,
+                accessed_time REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+
+    # get cached response
+    def get(self, url: str) -> CacheEntry:
+        row = self.__connection.execute(
+            "SELECT body, etag, last_modified, stored_time FROM response_cache WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        self.__connection.execute("UPDATE response_cache SET accessed_time = ? WHERE url = ?", (time.time(), url))
+        return CacheEntry(zlib.decompress(row[0]).decode("utf-8"), row[1], row[2], row[3])
+
+    # check if cached response can be used without revalidation
+    def is_fresh(self, url: str, entry: CacheEntry) -> bool:
+        if self.offline:
+            return True
+        if ResponseCache.ARTICLE_URL_PATTERN.search(url) is None:
+            return False
+        return time.time() - entry.stored_time < self.fresh_time
+
+    # headers of conditional request
+    def get_conditional_headers(self, entry: CacheEntry) -> dict[str, str]:
+        headers = dict()
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    # store response
+    def put(self, url: str, body: str, etag: str = None, last_modified: str = None) -> None:
+        compressed_body = zlib.compress(body.encode("utf-8"))
+        now = time.time()
+        self.__connection.execute(
+            """
+            INSERT OR REPLACE INTO response_cache (url, body, etag, last_modified, stored_time, accessed_time, size)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (url, compressed_body, etag, last_modified, now, now, len(compressed_body)),
+        )
+        self.__insert_count += 1
+        if self.__insert_count % ResponseCache.EVICT_INTERVAL == 0:
+            self.evict()
+
+    # mark response as revalidated
+    def touch(self, url: str) -> None:
+        now = time.time()
+        self.__connection.execute("UPDATE response_cache SET stored_time = ?, accessed_time = ? WHERE url = ?", (now, now, url))
+
+    # remove expired and least recently used entries
+    def evict(self) -> None:
+        if self.max_age is not None:
+            self.__connection.execute("DELETE FROM response_cache WHERE stored_time < ?", (time.time() - self.max_age,))
+        if self.max_size is not None:
+            total_size = self.__connection.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+            if total_size > self.max_size:
+                rows = self.__connection.execute("SELECT url, size FROM response_cache ORDER BY accessed_time").fetchall()
+                evicted_urls = list()
+                for url, size in rows:
+                    if total_size <= self.max_size:
+                        break
+                    evicted_urls.append((url,))
+                    total_size -= size
+                self.__connection.executemany("DELETE FROM response_cache WHERE url = ?", evicted_urls)
+
+    # close database
+    def close(self) -> None:
+        self.__connection.close()
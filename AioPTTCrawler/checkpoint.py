@@ -0,0 +1,95 @@
+import pickle
+import sqlite3
+import zlib
+
+from .columnar_data import ColumnarPTTData
+from .ptt_data import PTTData
+
+
+class CrawlCheckpoint:
+    # initial CrawlCheckpoint
+    def __init__(self, path: str) -> None:
+        """
+        On-disk store of finished pages. Each page's parsed data is flushed as soon as the page is done,
+        so an interrupted crawl can be resumed without fetching finished pages again.
+        Pages are keyed with the parse settings (fields, comments) they were crawled with,
+        so a crawl never resumes from pages parsed differently.
+
+        Parameters:
+        path (str): SQLite file path
+
+        Returns:
+        None
+        """
+        self.path = path
+        self.__connection = sqlite3.connect(path, isolation_level=None)
+        # one small transaction per page, WAL keeps them cheap
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_checkpoint (
+                board TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                columnar INTEGER NOT NULL,
+                settings TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (board, page, columnar, settings)
+            )
+            """
+        )
+
+    # store data of finished page
+    def put(self, board: str, page: int, ptt_data: PTTData | ColumnarPTTData, settings: str = "") -> None:
+        """
+        Storing page's data. Pages with failed urls aren't finished, they are skipped.
+
+        Parameters:
+        board (str): PTT board's name
+        page (int): page number
+        ptt_data (PTTData | ColumnarPTTData): data of the page
+        settings (str): parse settings of the crawl, only matching settings are resumed
+
+        Returns:
+        None
+        """
+        if ptt_data.get_failure():
+            return
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO crawl_checkpoint (board, page, columnar, settings, data) VALUES (?, ?, ?, ?, ?)",
+            (
+                board,
+                page,
+                isinstance(ptt_data, ColumnarPTTData),
+                settings,
+                zlib.compress(pickle.dumps(ptt_data, pickle.HIGHEST_PROTOCOL)),
+            ),
+        )
+
+    # get data of finished page
+    def get(self, board: str, page: int, columnar: bool = False, settings: str = "") -> PTTData | ColumnarPTTData:
+        row = self.__connection.execute(
+            "SELECT data FROM crawl_checkpoint WHERE board = ? AND page = ? AND columnar = ? AND settings = ?",
+            (board, page, columnar, settings),
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(zlib.decompress(row[0]))
+
+    # get finished page numbers in range
+    def get_finished_pages(
+        self, board: str, start_index: int, end_index: int, columnar: bool = False, settings: str = ""
+    ) -> set[int]:
+        rows = self.__connection.execute(
+            "SELECT page FROM crawl_checkpoint WHERE board = ? AND columnar = ? AND settings = ? AND page BETWEEN ? AND ?",
+            (board, columnar, settings, start_index, end_index),
+        )
+        return {row[0] for row in rows}
+
+    # forget finished pages of board
+    def clear(self, board: str) -> None:
+        self.__connection.execute("DELETE FROM crawl_checkpoint WHERE board = ?", (board,))
+
+    # close database
+    def close(self) -> None:
+        self.__connection.close()
@@ -0,0 +1,222 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from .model import Article, Comment
+from .parser import ArticleRecord
+from .ptt_data import PTTData
+
+
+class CategoryColumn:
+    # initial CategoryColumn
+    def __init__(self) -> None:
+        """
+        Column storing each distinct value once plus an int code per row. None is stored as code -1.
+
+        Parameters:
+        None
+
+        Returns:
+        None
+        """
+        self.codes: array = array("i")
+        self.categories: dict[str, int] = dict()
+
+    def append(self, value: str) -> None:
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self.categories.get(value)
+        if code is None:
+            code = self.categories[value] = len(self.categories)
+        self.codes.append(code)
+
+    def extend(self, column: "CategoryColumn") -> None:
+        # re-map other column's codes into this column's categories
+        mapping = array("i", (self.categories.setdefault(value, len(self.categories)) for value in column.categories))
+        self.codes.extend(-1 if code == -1 else mapping[code] for code in column.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self):
+        values = list(self.categories)
+        return (None if code == -1 else values[code] for code in self.codes)
+
+    def to_pandas(self) -> pd.Categorical:
+        return pd.Categorical.from_codes(np.frombuffer(self.codes, dtype=np.int32), categories=list(self.categories))
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        codes = np.frombuffer(self.codes, dtype=np.int32)
+        indices = pa.array(codes, mask=codes == -1)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(list(self.categories), type=pa.string()))
+
+
+class ColumnarPTTData:
+    # columns stored as CategoryColumn
+    CATEGORY_FIELD: set[str] = {"board", "tag", "user_id"}
+
+    # initial ColumnarPTTData object
+    def __init__(self) -> None:
+        """
+        Column-wise store of PTT data. Articles and comments are kept as one list per field
+        (board, tag and user_id are category encoded) instead of one object per row,
+        so they can be exported to pandas or pyarrow without per-row conversion.
+
+        Parameters:
+        None
+
+        Returns:
+        None
+        """
+        self.__article_columns: dict[str, list | CategoryColumn] = ColumnarPTTData.__create_columns(Article.article_field)
+        self.__comment_columns: dict[str, list | CategoryColumn] = ColumnarPTTData.__create_columns(Comment.comment_field)
+        self.__failure_dict: dict[str, str] = dict()
+
+    @staticmethod
+    def __create_columns(fields: list[str]) -> dict[str, list | CategoryColumn]:
+        return {name: CategoryColumn() if name in ColumnarPTTData.CATEGORY_FIELD else list() for name in fields}
+
+    # append data into columns
+    def append(self, obj: Article | Comment) -> None:
+        """
+        append data into ColumnarPTTData, only accept Article and Comment object
+
+        Parameters:
+        obj (Article | Comment): data need to be append
+
+        Returns:
+        None
+        """
+        # check obj's instance
+        if isinstance(obj, Article):
+            columns = self.__article_columns
+        elif isinstance(obj, Comment):
+            columns = self.__comment_columns
+        else:
+            raise TypeError(f"Can't append {type(obj)}. Only accept <class 'Article'> or <class 'Comment'>.")
+        for column, value in zip(columns.values(), obj.to_list()):
+            column.append(value)
+
+    # append parsed record into columns
+    def append_record(self, record: ArticleRecord, board: str) -> None:
+        """
+        append parser's record (article and its comments, or its comment summary) without building Article and Comment objects
+
+        Parameters:
+        record (ArticleRecord): record returned by parser
+        board (str): PTT board's name
+
+        Returns:
+        None
+        """
+        article_id, title, user_id, user_name, post_time, context, ip_address, comment_records = record
+        # comments="summary" returns counts of push tags instead of comments
+        comment_summary = None
+        if isinstance(comment_records, dict):
+            comment_summary, comment_records = comment_records, list()
+        for column, value in zip(
+            self.__article_columns.values(),
+            (article_id, title, user_id, user_name, board, post_time, context, ip_address, None, comment_summary),
+        ):
+            column.append(value)
+
+        comment_columns = list(self.__comment_columns.values())
+        comment_columns[0].extend([article_id] * len(comment_records))
+        for column, values in zip(comment_columns[1:], zip(*comment_records)):
+            if isinstance(column, CategoryColumn):
+                for value in values:
+                    column.append(value)
+            else:
+                column.extend(values)
+
+    # record url which couldn't be fetched
+    def add_failure(self, url: str, error: Exception | str) -> None:
+        self.__failure_dict[url] = str(error) or type(error).__name__
+
+    # get failed url and its error message
+    def get_failure(self) -> dict[str, str]:
+        return self.__failure_dict
+
+    # update self's data by another ColumnarPTTData or PTTData
+    def update(self, ptt_data: "ColumnarPTTData | PTTData") -> None:
+        self.__failure_dict.update(ptt_data.get_failure())
+        if isinstance(ptt_data, PTTData):
+            for article in ptt_data.get_article():
+                self.append(article)
+            for comment in ptt_data.get_comment():
+                self.append(comment)
+            return
+
+        for columns, other_columns in (
+            (self.__article_columns, ptt_data.get_article_columns()),
+            (self.__comment_columns, ptt_data.get_comment_columns()),
+        ):
+            for name, column in columns.items():
+                column.extend(other_columns[name])
+
+    # get origin columns of article
+    def get_article_columns(self) -> dict[str, list | CategoryColumn]:
+        return self.__article_columns
+
+    # get origin columns of comment
+    def get_comment_columns(self) -> dict[str, list | CategoryColumn]:
+        return self.__comment_columns
+
+    # amount of articles
+    def get_article_count(self) -> int:
+        return len(self.__article_columns["article_id"])
+
+    # amount of comments
+    def get_comment_count(self) -> int:
+        return len(self.__comment_columns["article_id"])
+
+    # return article as list
+    def get_article_list(self) -> list:
+        return [list(row) for row in zip(*self.__article_columns.values())]
+
+    # return comment as list
+    def get_comment_list(self) -> list:
+        return [list(row) for row in zip(*self.__comment_columns.values())]
+
+    # return article as dataframe
+    def get_article_dataframe(self) -> pd.DataFrame:
+        return ColumnarPTTData.__to_dataframe(self.__article_columns)
+
+    # return comment as dataframe
+    def get_comment_dataframe(self) -> pd.DataFrame:
+        return ColumnarPTTData.__to_dataframe(self.__comment_columns)
+
+    # return article as pyarrow.Table
+    def get_article_arrow(self):
+        return ColumnarPTTData.__to_arrow(self.__article_columns)
+
+    # return comment as pyarrow.Table
+    def get_comment_arrow(self):
+        return ColumnarPTTData.__to_arrow(self.__comment_columns)
+
+    @staticmethod
+    def __to_dataframe(columns: dict[str, list | CategoryColumn]) -> pd.DataFrame:
+        return pd.DataFrame(
+            {name: column.to_pandas() if isinstance(column, CategoryColumn) else column for name, column in columns.items()}
+        )
+
+    @staticmethod
+    def __to_arrow(columns: dict[str, list | CategoryColumn]):
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("pyarrow is required to export arrow table, install it by `pip install AioPTTCrawler[arrow]`.") from e
+
+        return pa.table({name: column.to_arrow() if isinstance(column, CategoryColumn) else pa.array(column) for name, column in columns.items()})
+
+
+def main():
+    ptt = ColumnarPTTData()
+
+
+if __name__ == "__main__":
+    main()
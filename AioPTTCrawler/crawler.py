@@ -1,12 +1,15 @@
 import asyncio
-import re
-from datetime import datetime, timedelta
-
-import aiohttp
-from lxml import etree
-
-from .model import Article, Comment
+import time
+from concurrent.futures import Executor
+from datetime import datetime
+
+from .columnar_data import ColumnarPTTData
+from .decoder import article_id_to_datetime
+from .model import Article, Comment, IndexEntry
+from .page_index import PageIndex
+from .parser import ARTICLE_PARSERS, ArticleRecord, parse_index_entries, parse_index_page
 from .ptt_data import PTTData
+from .scheduler import RequestScheduler
 
 
 class Crawler:
@@ -15,12 +18,36 @@ class Crawler:
     article_filed: list[str] = [""]
 
     # initial Crawler
-    def __init__(self, board: str, page_number: int) -> None:
+    def __init__(
+        self,
+        board: str,
+        page_number: int,
+        scheduler: RequestScheduler,
+        page_index: PageIndex = None,
+        parser_executor: Executor = None,
+        parser_engine: str = "xpath",
+        columnar: bool = False,
+        ptt_url: str = None,
+        time_range: tuple[datetime, datetime] = None,
+        fields: frozenset[str] = None,
+        comments: bool | str = True,
+    ) -> None:
         self.board = board
         self.page_number = page_number
+        self.scheduler = scheduler
+        self.page_index = page_index
+        self.parser_executor = parser_executor
+        self.parser_engine = parser_engine
+        self.columnar = columnar
+        self.ptt_url = ptt_url if ptt_url is not None else Crawler.PTT_URL
+        # only articles posted in time range are fetched, judged by article id
+        self.time_range = time_range
+        # parts of article the parser extracts
+        self.fields = fields
+        self.comments = comments
 
     # get ptt board articles with specific page
-    async def get_specific_page_data(self, sem, show_progress=False) -> PTTData:
+    async def get_specific_page_data(self, sem, show_progress=False) -> PTTData | ColumnarPTTData:
         """
         Getting PTT board's articles with specific page.
 
@@ -28,250 +55,242 @@ class Crawler:
         None
 
         Returns:
-        PTTData: preprocessed data from website response
+        PTTData | ColumnarPTTData: preprocessed data from website response, ColumnarPTTData if crawler is columnar.
+        Urls which couldn't be fetched are reported by get_failure().
         """
         async with sem:
             if show_progress:
                 print(f"Start crawling {self.board}: {self.page_number}")
-            url = f"{Crawler.PTT_URL}/bbs/{self.board}/index{self.page_number}.html"
+            url = f"{self.ptt_url}/bbs/{self.board}/index{self.page_number}.html"
             try:
-                result = await self.get_url_data(url)
+                result = await self.get_url_data(url, RequestScheduler.LOW_PRIORITY)
             except Exception as e:
-                print(e)
-                print(f"{self.board}: getting {url} error.")
-                return None
+                print(f"{self.board}: getting {url} error. {e}")
+                ptt_data = ColumnarPTTData() if self.columnar else PTTData()
+                ptt_data.add_failure(url, e)
+                return ptt_data
             processed_result = await self.processing_data(result)
             if show_progress:
                 print(f"Finish crawling {self.board}: {self.page_number}")
             return processed_result
 
-    # get original data from url
-    async def get_url_data(self, url: str) -> str:
+    # get post time of articles with specific page, read from the listing only
+    async def get_page_timestamps(self) -> list[datetime]:
         """
-        Getting data from url with async HTTP request.
+        Getting post time of every article on the page without downloading the articles.
+        The time is decoded from article id (e.g. M.1663144920.A.A6E), deleted articles are skipped.
 
         Parameters:
-        url (str): url where data comes from
+        None
 
         Returns:
-        str: original response text
+        list[datetime]: post time in page order
         """
-        # create async http session
-        async with aiohttp.ClientSession() as session:
-            # get data from async http request
-            async with session.get(url=url, cookies=Crawler.COOKIES) as response:
-                # waiting for the data to be received
-                html = await response.text(encoding="utf-8")
-                # return original data
-                return html
+        url = f"{self.ptt_url}/bbs/{self.board}/index{self.page_number}.html"
+        result = await self.get_url_data(url)
 
-    # processing data
-    async def processing_data(self, original_text: str) -> PTTData:
-        # part 1. remove on-top articles
-        tree = self.__remove_on_top_article(etree.HTML(original_text))
+        _, article_ids = await self.__parse(parse_index_page, result, self.ptt_url)
 
-        # part 2. get article links
-        article_links, article_ids = self.__get_article_links(tree)
-        # article_links, article_ids = ["https://www.ptt.cc/bbs/Gossiping/M.1663144920.A.A6E.html"], ["M.1663144920.A.A6E"]
+        return self.__record_page_timestamps(article_ids)
 
-        # part 3. get article content
-        article_content = await self.__get_article_content(article_links)
+    # get article entries with specific page, read from the listing only
+    async def get_index_entries(self) -> list[IndexEntry]:
+        """
+        Getting id, link, title, author, date and push count of every article on the page
+        without downloading the articles.
 
-        # part 4. filter article content
-        ptt_data = self.__filter_article_content(article_content, article_ids)
+        Parameters:
+        None
 
-        return ptt_data
+        Returns:
+        list[IndexEntry]: entries in page order
+        """
+        url = f"{self.ptt_url}/bbs/{self.board}/index{self.page_number}.html"
+        result = await self.get_url_data(url)
+
+        entries = await self.__parse(parse_index_entries, result, self.ptt_url)
+        if self.page_index is not None:
+            self.__record_page_timestamps([entry.article_id for entry in entries])
+        return entries
 
-    # part 1. remove on-top article in etree
-    def __remove_on_top_article(self, tree: etree.HTML) -> etree.HTML:
+    # get article stubs with specific page, read from the listing only
+    async def get_listing_data(self, sem, show_progress=False) -> PTTData:
         """
-        Removing on-top article by detect on-top article separate line in article html div.
+        Getting PTT board's articles with specific page without downloading them.
+        Articles are stubs: id, title, author (user_id), post time (decoded from article id) and push count,
+        their content and comments can be fetched later by PTTData.fetch_content.
 
         Parameters:
-        tree (etree.HTML)
+        None
 
         Returns:
-        etree.HTML
+        PTTData: article stubs, urls which couldn't be fetched are reported by get_failure()
         """
-        on_top_article_sep = False
-        article_separate_line_xpath = "r-list-sep"
-        article_xpath = '//*[@id="main-container"]/div[2]/div'
-        # loop all article node and remove on-top articles
-        for node in tree.xpath(article_xpath):
-            # get html div class name
-            class_name = node.get("class")
-
-            # "r-list-sep" means the separate line between normal articles and on-top articles
-            if class_name == article_separate_line_xpath:
-                on_top_article_sep = True
-
-            # remove node if meet the separate line
-            if on_top_article_sep:
-                node.getparent().remove(node)
-
-        # return processed etree
-        return tree
-
-    # part 2. get links from etree
-    def __get_article_links(self, tree: etree.HTML) -> list[str]:
+        async with sem:
+            if show_progress:
+                print(f"Start crawling {self.board}: {self.page_number}")
+            ptt_data = PTTData()
+            try:
+                entries = await self.get_index_entries()
+            except Exception as e:
+                url = f"{self.ptt_url}/bbs/{self.board}/index{self.page_number}.html"
+                print(f"{self.board}: getting {url} error. {e}")
+                ptt_data.add_failure(url, e)
+                return ptt_data
+            for entry in entries:
+                ptt_data.append(
+                    Article(
+                        article_id=entry.article_id,
+                        article_title=entry.title,
+                        user_id=entry.author,
+                        user_name=None,
+                        board=self.board,
+                        post_time=article_id_to_datetime(entry.article_id),
+                        context=None,
+                        ip_address=None,
+                        push_count=entry.push_count,
+                        is_stub=True,
+                    )
+                )
+            if show_progress:
+                print(f"Finish crawling {self.board}: {self.page_number}")
+            return ptt_data
+
+    # record time span of this page into page index
+    def __record_page_timestamps(self, article_ids: list[str]) -> list[datetime]:
+        timestamps = list()
+        for article_id in article_ids:
+            post_time = article_id_to_datetime(article_id)
+            if post_time is not None:
+                timestamps.append(post_time)
+        if self.page_index is not None:
+            self.page_index.update(self.board, self.page_number, timestamps)
+        return timestamps
+
+    # get original data from url
+    async def get_url_data(self, url: str, priority: int = RequestScheduler.HIGH_PRIORITY) -> str:
         """
-        Get article links from etree by xpath
+        Getting data from url with async HTTP request through the shared request scheduler.
 
         Parameters:
-        tree (etree.HTML)
+        url (str): url where data comes from
+        priority (int): queue priority of the request
 
         Returns:
-        list[str]: list of PTT article link
-        list[str]: list of PTT article id
+        str: original response text
         """
-        link_xpath = '//*[@id="main-container"]/div[2]/div/div[2]/a'
-        article_id_pattern = "/bbs/.*?/(.*?)\.html"
-        article_links = list()
-        article_ids = list()
-        # loop and store all article link
-        for node in tree.xpath(link_xpath):
-            href = node.get("href")
-            article_ids.append(re.search(article_id_pattern, href).group(1))
-            article_links.append(f"{Crawler.PTT_URL}{href}")
-
-        # return article links
-        return article_links, article_ids
+        return await self.scheduler.fetch(url, priority, self.board)
 
-    # part 3. get article content
-    async def __get_article_content(self, article_links: list[str]) -> list[str]:
+    # processing data
+    async def processing_data(self, original_text: str) -> PTTData | ColumnarPTTData:
+        # part 1 & 2. remove on-top articles and get article links
+        article_links, article_ids = await self.__parse(parse_index_page, original_text, self.ptt_url)
+        # article_links, article_ids = ["https://www.ptt.cc/bbs/Gossiping/M.1663144920.A.A6E.html"], ["M.1663144920.A.A6E"]
+        if self.page_index is not None:
+            self.__record_page_timestamps(article_ids)
+        if self.time_range is not None:
+            article_links, article_ids = self.__filter_by_time_range(article_links, article_ids)
+
+        return await self.get_articles_data(article_links, article_ids)
+
+    # keep articles whose id timestamp is in time range, articles without timestamp are kept
+    def __filter_by_time_range(self, article_links: list[str], article_ids: list[str]) -> tuple[list[str], list[str]]:
+        start_time, end_time = self.time_range
+        kept_links, kept_ids = list(), list()
+        for link, article_id in zip(article_links, article_ids):
+            post_time = article_id_to_datetime(article_id)
+            if post_time is None or start_time <= post_time <= end_time:
+                kept_links.append(link)
+                kept_ids.append(article_id)
+        return kept_links, kept_ids
+
+    # get and filter specific articles
+    async def get_articles_data(self, article_links: list[str], article_ids: list[str]) -> PTTData | ColumnarPTTData:
         """
-        Get article content from link
+        Getting articles by link, e.g. links picked from index entries.
 
         Parameters:
         article_links (list[str]): list of PTT article link
+        article_ids (list[str]): list of PTT article id
 
         Returns:
-        list[str]: list of PTT article content
+        PTTData | ColumnarPTTData: ColumnarPTTData if crawler is columnar
         """
-        # get event loop
-        event_loop = asyncio.get_event_loop()
+        # part 3 & 4. get and filter every article as soon as its content arrives
+        results = await asyncio.gather(
+            *[self.__get_article(link, article_id) for link, article_id in zip(article_links, article_ids)],
+            return_exceptions=True,
+        )
+
+        # part 5. store records, failed articles are reported instead of failing the page
+        ptt_data = ColumnarPTTData() if self.columnar else PTTData()
+        records = list()
+        for link, result in zip(article_links, results):
+            if isinstance(result, Exception):
+                ptt_data.add_failure(link, result)
+            elif result is not None:
+                records.append(result)
+
+        if self.columnar:
+            for record in records:
+                ptt_data.append_record(record, self.board)
+            return ptt_data
+
+        # comments are stored with their article
+        for record in records:
+            ptt_data.append(self.__build_article(record))
+
+        return ptt_data
 
-        # list all task
-        tasks = [event_loop.create_task(self.get_url_data(link)) for link in article_links]
+    # part 3 & 4. get article content and filter it
+    async def __get_article(self, article_link: str, article_id: str) -> ArticleRecord:
+        content = await self.__get_article_content(article_link)
+        metrics = self.scheduler.metrics
+        start_time = time.perf_counter()
+        record = await self.__parse(ARTICLE_PARSERS[self.parser_engine], content, article_id, self.fields, self.comments)
+        metrics.observe("parse_seconds", time.perf_counter() - start_time)
+        metrics.increase("articles_parsed_total")
+        return record
+
+    # run parsing function in parser executor if there is one
+    async def __parse(self, function, *args):
+        if self.parser_executor is None:
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.parser_executor, function, *args)
 
-        content_list = list()
+    # part 3. get article content
+    async def __get_article_content(self, article_link: str) -> str:
+        """
+        Get article content from link
 
-        # waiting all tasks to be done
-        for task in tasks:
-            result = await task
-            content_list.append(result)
+        Parameters:
+        article_link (str): PTT article link
 
-        # return article links
-        return content_list
+        Returns:
+        str: PTT article content
+        """
+        # article requests go before index requests, so started pages finish first
+        return await self.get_url_data(article_link, RequestScheduler.HIGH_PRIORITY)
 
-    # part 4. filter article content
-    def __filter_article_content(self, article_content: list[str], article_ids: list[str]) -> PTTData:
+    # part 5. build Article from parsed record
+    def __build_article(self, record: ArticleRecord) -> Article:
         """
-        Get author, title, post-time, content, comment in article
+        Build Article and its Comment from record returned by parser.
 
         Parameters:
-        article_content (list[str]): list of PTT article content
-        article_ids (list[str]): list of PTT article id
+        record (ArticleRecord): parsed article
 
         Returns:
-        PTTData
+        Article
         """
-        ptt_data = PTTData()
-        main_content_xpath = '//*[@id="main-content"]'
-
-        article_xpath_dict = {
-            "author": '//*[@id="main-content"]/div[1]',
-            "title": '//*[@id="main-content"]/div[3]',
-            "post_time": '//*[@id="main-content"]/div[4]',
-        }
-        comment_xpath_dict = {
-            "comment": "//div[@class='push']",
-            "push_tag": "//div[@class='push']/span[1]",
-            "push_user_id": "//div[@class='push']/span[2]",
-            "push_content": "//div[@class='push']/span[3]",
-            "push_ip_date_time": "//div[@class='push']/span[4]",
-        }
-        comment_ip_pattern = r"(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"
-        comment_datetime_pattern = r"(\d{,2}/\d{,2} \d{,2}:\d{,2})"
-        # loop content and extract useful information
-        for article_id, content in zip(article_ids, article_content):
-            try:
-                lxml_tree = etree.HTML(content).xpath(main_content_xpath)[0]
-
-                article_data = dict()
-                # skip data if it is incomplete.
-                try:
-                    for key, value in article_xpath_dict.items():
-                        article_data[key] = lxml_tree.xpath(value)[0].xpath("span")[1].text
-                except IndexError as IE:
-                    continue
-
-                # get author
-                full_name = article_data["author"][:-1].split(" (")
-                user_id, user_name = full_name[0], full_name[0] if len(full_name) != 2 else full_name[1]
-                # get title
-                title = article_data["title"]
-                # get post date
-                try:
-                    post_time = datetime.strptime(article_data["post_time"].replace(" ", "|").replace("||", "|0"), "%a|%b|%d|%H:%M:%S|%Y")
-                except ValueError as VE:
-                    previous_time = ptt_data.get_last_article()
-                    # skip data if it is incomplete.
-                    if previous_time is None:
-                        continue
-                    post_time = previous_time.post_time + timedelta(seconds=1)
-
-                # get comment
-                comment_list = []
-                comment_data = [
-                    range(len(lxml_tree.xpath(comment_xpath_dict["comment"]))),
-                    lxml_tree.xpath(comment_xpath_dict["push_tag"]),
-                    lxml_tree.xpath(comment_xpath_dict["push_user_id"]),
-                    lxml_tree.xpath(comment_xpath_dict["push_content"]),
-                    lxml_tree.xpath(comment_xpath_dict["push_ip_date_time"]),
-                ]
-                for idx, push_tag, push_user_id, push_content, push_ip_date_time in zip(*comment_data):
-                    _push_tag = push_tag.text.replace(" ", "")
-                    _push_user_id = push_user_id.text
-                    _push_content = push_content.text[2:] if len(push_content.text) > 2 else ""
-                    _push_ip_date_time = re.sub("[\n]", "", push_ip_date_time.text)
-                    _push_ip = re.search(comment_ip_pattern, _push_ip_date_time)
-                    _push_ip = _push_ip.group(1) if _push_ip else None
-                    try:
-                        _push_date_time = datetime.strptime(
-                            str(post_time.year) + "/" + re.search(comment_datetime_pattern, _push_ip_date_time).group(1), "%Y/%m/%d %H:%M"
-                        )
-                    except:
-                        _push_date_time = None
-
-                    # append into ptt_data
-                    comment = Comment(article_id, _push_tag, _push_user_id, idx + 1, _push_content, _push_date_time, _push_ip)
-                    ptt_data.append(comment)
-                    comment_list.append(comment)
-
-                # get context
-                # remove all comments, leave only article context
-                delete_flag = False
-                for i in lxml_tree.xpath("./*"):
-                    if i.get("class") == "f2":
-                        delete_flag = True
-                    if delete_flag:
-                        i.getparent().remove(i)
-                context_xpath = "//div[@class='article-metaline'][3]/following-sibling::text()"
-                context_list = lxml_tree.xpath(context_xpath)
-                # remove all \n, \t
-                context = "".join(map(lambda x: re.sub(r"[\s\t]", "", x), context_list))
-                # get ip
-                ip_address = re.search(comment_ip_pattern, content)
-                ip_address = ip_address.group(1) if ip_address else ""
-
-                # append into ptt_data
-                article = Article(article_id, title, user_id, user_name, self.board, post_time, context, ip_address, comment_list)
-                ptt_data.append(article)
-            except Exception as e:
-                print("Getting article error: ", e)
-
-        return ptt_data
+        article_id, title, user_id, user_name, post_time, context, ip_address, comment_records = record
+        # comments="summary" returns counts of push tags instead of comments
+        if isinstance(comment_records, dict):
+            return Article(
+                article_id, title, user_id, user_name, self.board, post_time, context, ip_address, comment_summary=comment_records
+            )
+        comment_list = [Comment(article_id, *comment_record) for comment_record in comment_records]
+        return Article(article_id, title, user_id, user_name, self.board, post_time, context, ip_address, comment_list)
 
 
 def main():
@@ -0,0 +1,135 @@
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+# Decoding of the time and IP fields found in PTT pages.
+# Every pattern is compiled once, and push time decoding is memoized,
+# because popular articles carry thousands of pushes posted in the same minutes.
+
+PTT_TIMEZONE: timezone = timezone(timedelta(hours=8))
+IP_PATTERN: re.Pattern = re.compile(r"(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})")
+PUSH_DATETIME_PATTERN: re.Pattern = re.compile(r"(\d{,2}/\d{,2} \d{,2}:\d{,2})")
+ARTICLE_TIMESTAMP_PATTERN: re.Pattern = re.compile(r"^M\.(\d+)\.A")
+MONTHS: dict[str, int] = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+
+
+# decode post time from article id
+def article_id_to_datetime(article_id: str) -> datetime:
+    """
+    Decoding the Unix timestamp embedded in article id into PTT local time.
+
+    Parameters:
+    article_id (str): PTT article id. ex: M.1663144920.A.A6E
+
+    Returns:
+    datetime: naive datetime in PTT's timezone, None if article id has no timestamp
+    """
+    matched = ARTICLE_TIMESTAMP_PATTERN.search(article_id)
+    if matched is None:
+        return None
+    return datetime.fromtimestamp(int(matched.group(1)), PTT_TIMEZONE).replace(tzinfo=None)
+
+
+# decode first IP address in text
+def decode_ip(text: str) -> str:
+    """
+    Parameters:
+    text (str): text which may contain IP address. ex: " 27.53.96.42 09/14 16:42"
+
+    Returns:
+    str: IP address, None if there is no IP address
+    """
+    matched = IP_PATTERN.search(text)
+    return matched.group(1) if matched else None
+
+
+# decode article header time
+def decode_post_time(text: str) -> datetime:
+    """
+    Decoding article's post time without strptime.
+
+    Parameters:
+    text (str): post time in article header. ex: "Wed Sep  4 16:41:58 2022"
+
+    Returns:
+    datetime
+
+    Raises:
+    ValueError: text is not in PTT's post time format
+    """
+    try:
+        _, month, day, clock, year = text.split()
+        hour, minute, second = clock.split(":")
+        return datetime(int(year), MONTHS[month], int(day), int(hour), int(minute), int(second))
+    except (KeyError, AttributeError) as e:
+        raise ValueError(f"Can't decode post time: <{text}>.") from e
+
+
+# decode push count shown in board's index page
+def decode_push_count(text: str) -> int:
+    """
+    Parameters:
+    text (str): push count in listing. ex: "", "12", "爆", "X3", "XX"
+
+    Returns:
+    int: push count, "爆" is 100, "X3" is -30, "XX" is -100, unknown text is 0
+    """
+    text = (text or "").strip()
+    if text == "爆":
+        return 100
+    if text == "XX":
+        return -100
+    try:
+        if text.startswith("X"):
+            return -10 * int(text[1:])
+        return int(text)
+    except ValueError:
+        return 0
+
+
+# decode push time
+def decode_push_datetime(text: str, post_time: datetime) -> datetime:
+    """
+    Decoding push time ("MM/DD HH:MM", no year) in push's ip-datetime text.
+    Push time takes the year of post time, and the next year when it would be more than
+    one day before the article was posted, e.g. pushes on 01/01 of an article posted on 12/31.
+
+    Parameters:
+    text (str): push's ip-datetime text. ex: " 27.53.96.42 09/14 16:42"
+    post_time (datetime): article's post time
+
+    Returns:
+    datetime: None if text has no valid push time
+    """
+    matched = PUSH_DATETIME_PATTERN.search(text)
+    if matched is None:
+        return None
+    push_time = _decode_month_day_time(post_time.year, matched.group(1))
+    if push_time is None or push_time < post_time - timedelta(days=1):
+        push_time = _decode_month_day_time(post_time.year + 1, matched.group(1))
+    return push_time
+
+
+# decode "MM/DD HH:MM" in specific year
+@lru_cache(maxsize=65536)
+def _decode_month_day_time(year: int, month_day_time: str) -> datetime:
+    try:
+        month_day, clock = month_day_time.split(" ")
+        month, day = month_day.split("/")
+        hour, minute = clock.split(":")
+        return datetime(year, int(month), int(day), int(hour), int(minute))
+    except ValueError:
+        return None
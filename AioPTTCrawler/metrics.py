@@ -0,0 +1,128 @@
+import json
+from bisect import bisect_left
+from collections.abc import Callable
+
+
+class Histogram:
+    # default buckets in seconds
+    DEFAULT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    # initial Histogram
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    # cumulative count of each upper bound, the last one is +Inf
+    def get_cumulative_counts(self) -> list[tuple[float, int]]:
+        result = list()
+        total = 0
+        for upper_bound, count in zip(self.buckets + (float("inf"),), self.bucket_counts):
+            total += count
+            result.append((upper_bound, total))
+        return result
+
+
+class CrawlMetrics:
+    # metric name prefix in prometheus text
+    PREFIX: str = "ptt_crawler_"
+
+    # initial CrawlMetrics
+    def __init__(self) -> None:
+        """
+        Counters, gauges and latency histograms of one crawler.
+
+        Metrics:
+        requests_total, request_errors_total, retries_total, dropped_urls_total,
+        cache_hits_total, bytes_downloaded_total, articles_parsed_total (counter)
+        queue_depth, concurrency_limit (gauge)
+        fetch_seconds, parse_seconds (histogram)
+
+        Parameters:
+        None
+
+        Returns:
+        None
+        """
+        self.counters: dict[str, float] = dict()
+        self.gauges: dict[str, float] = dict()
+        self.histograms: dict[str, Histogram] = dict()
+        self.__hooks: list[Callable[[str, float], None]] = list()
+
+    # register callback called on every metric update
+    def add_hook(self, hook: Callable[[str, float], None]) -> None:
+        """
+        Parameters:
+        hook (Callable[[str, float], None]): called with metric name and the value of this update
+        (increment of counter, new value of gauge, observation of histogram)
+
+        Returns:
+        None
+        """
+        self.__hooks.append(hook)
+
+    # remove registered callback
+    def remove_hook(self, hook: Callable[[str, float], None]) -> None:
+        self.__hooks.remove(hook)
+
+    def increase(self, name: str, value: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+        self.__call_hooks(name, value)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self.gauges[name] = value
+        self.__call_hooks(name, value)
+
+    def observe(self, name: str, value: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(value)
+        self.__call_hooks(name, value)
+
+    def __call_hooks(self, name: str, value: float) -> None:
+        for hook in self.__hooks:
+            hook(name, value)
+
+    # return all metrics as dict
+    def snapshot(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "histograms": {
+                name: {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "buckets": {str(upper_bound): count for upper_bound, count in histogram.get_cumulative_counts()},
+                }
+                for name, histogram in self.histograms.items()
+            },
+        }
+
+    # return all metrics as json
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot())
+
+    # return all metrics in prometheus text exposition format
+    def to_prometheus(self) -> str:
+        lines = list()
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {CrawlMetrics.PREFIX}{name} counter")
+            lines.append(f"{CrawlMetrics.PREFIX}{name} {value}")
+        for name, value in self.gauges.items():
+            lines.append(f"# TYPE {CrawlMetrics.PREFIX}{name} gauge")
+            lines.append(f"{CrawlMetrics.PREFIX}{name} {value}")
+        for name, histogram in self.histograms.items():
+            lines.append(f"# TYPE {CrawlMetrics.PREFIX}{name} histogram")
+            for upper_bound, count in histogram.get_cumulative_counts():
+                le = "+Inf" if upper_bound == float("inf") else str(upper_bound)
+                lines.append(f'{CrawlMetrics.PREFIX}{name}_bucket{{le="{le}"}} {count}')
+            lines.append(f"{CrawlMetrics.PREFIX}{name}_sum {histogram.sum}")
+            lines.append(f"{CrawlMetrics.PREFIX}{name}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
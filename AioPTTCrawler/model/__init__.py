@@ -1,3 +1,4 @@
 from .article import Article
 from .author import Author
 from .comment import Comment
+from .index_entry import IndexEntry
@@ -1,10 +1,26 @@
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import ClassVar
+
 from .comment import Comment
 
 
-@dataclass
+@dataclass(slots=True)
 class Article:
+    # column names shared by all articles
+    article_field: ClassVar[list[str]] = [
+        "article_id",
+        "article_title",
+        "user_id",
+        "user_name",
+        "board",
+        "datetime",
+        "context",
+        "ip_address",
+        "push_count",
+        "comment_summary",
+    ]
+
     article_id: str
     article_title: str
     user_id: str
@@ -14,21 +30,21 @@ class Article:
     context: str
     ip_address: str
     comment_list: list[Comment] = field(default_factory=list)
-    article_field: list[str] = field(default_factory=list, init=False)
-    data_list: list = field(default_factory=list, init=False)
+    # push count shown in board's listing, only known for articles crawled from listing
+    push_count: int = None
+    # listing-only article whose content and comments aren't fetched yet
+    is_stub: bool = False
+    # amount of each push tag (推, 噓, →), only set if crawled with comments="summary"
+    comment_summary: dict[str, int] = None
 
-    def __post_init__(self) -> None:
-        self.article_field = [
-            "article_id",
-            "article_title",
-            "user_id",
-            "user_name",
-            "board",
-            "datetime",
-            "context",
-            "ip_address",
-        ]
-        self.data_list = [
+    # all value in article_field's order
+    @property
+    def data_list(self) -> list:
+        return self.to_list()
+
+    # return all value as list(exclude comment_list)
+    def to_list(self) -> list:
+        return [
             self.article_id,
             self.article_title,
             self.user_id,
@@ -37,22 +53,16 @@ class Article:
             self.post_time,
             self.context,
             self.ip_address,
+            self.push_count,
+            self.comment_summary,
         ]
 
-    # return all value as list(exclude comment_list)
-    def to_list(self) -> list:
-        return self.data_list
-
     # return all value as dict(include comment_list)
     def to_dict(self) -> dict:
-        result = dict()
-        for key, value in zip(self.article_field, self.data_list):
-            result[key] = value
-        result["comment_list"] = list()
+        result = dict(zip(self.article_field, self.to_list()))
 
         # add comment
-        for comment in self.comment_list:
-            result["comment_list"].append(comment.to_dict())
+        result["comment_list"] = [comment.to_dict() for comment in self.comment_list]
 
         # return data
         return result
@@ -1,9 +1,21 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime
+from typing import ClassVar
 
 
-@dataclass
+@dataclass(slots=True)
 class Comment:
+    # column names shared by all comments
+    comment_field: ClassVar[list[str]] = [
+        "article_id",
+        "tag",
+        "user_id",
+        "comment_order",
+        "context",
+        "datetime",
+        "ip_address",
+    ]
+
     article_id: str
     tag: str
     user_id: str
@@ -11,31 +23,19 @@ class Comment:
     context: str
     post_time: datetime
     ip_address: str
-    comment_field: list[str] = field(default_factory=list, init=False)
-    data_list: list = field(default_factory=list, init=False)
-
-    def __post_init__(self) -> None:
-        self.comment_field = [
-            "article_id",
-            "tag",
-            "user_id",
-            "comment_order",
-            "context",
-            "datetime",
-            "ip_address",
-        ]
-        self.data_list = [self.article_id, self.tag, self.user_id, self.comment_order, self.context, self.post_time, self.ip_address]
+
+    # all value in comment_field's order
+    @property
+    def data_list(self) -> list:
+        return self.to_list()
 
     # return all value as dict
     def to_dict(self) -> dict:
-        return_dict = dict()
-        for key, value in zip(self.comment_field, self.data_list):
-            return_dict[key] = value
-        return return_dict
+        return dict(zip(self.comment_field, self.to_list()))
 
     # return all value as list
     def to_list(self) -> list:
-        return
+        return [self.article_id, self.tag, self.user_id, self.comment_order, self.context, self.post_time, self.ip_address]
 
 
 def main():
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class IndexEntry:
+    article_id: str
+    link: str
+    title: str
+    author: str
+    date: str
+    push_count: int
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
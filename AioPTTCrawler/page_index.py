@@ -0,0 +1,94 @@
+import sqlite3
+from datetime import datetime
+
+
+class PageIndex:
+    # initial PageIndex
+    def __init__(self, path: str) -> None:
+        """
+        On-disk index mapping board's page number to the time span of its articles.
+        Page numbers of a board are stable, so the span learned once can be reused by later date searches.
+
+        Parameters:
+        path (str): SQLite file path
+
+        Returns:
+        None
+        """
+        self.path = path
+        self.__connection = sqlite3.connect(path, isolation_level=None)
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS page_index (
+                board TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                min_time TEXT NOT NULL,
+                max_time TEXT NOT NULL,
+                PRIMARY KEY (board, page)
+            )
+            """
+        )
+
+    # store time span of page
+    def update(self, board: str, page: int, timestamps: list[datetime]) -> None:
+        """
+        Storing or widening the time span of page.
+
+        Parameters:
+        board (str): PTT board's name
+        page (int): page number
+        timestamps (list[datetime]): post time of articles on the page
+
+        Returns:
+        None
+        """
+        if not timestamps:
+            return
+        self.__connection.execute(
+            """
+            INSERT INTO page_index (board, page, min_time, max_time) VALUES (?, ?, ?, ?)
+            ON CONFLICT (board, page) DO UPDATE SET
+                min_time = MIN(min_time, excluded.min_time),
+                max_time = MAX(max_time, excluded.max_time)
+            """,
+            (board, page, min(timestamps).isoformat(), max(timestamps).isoformat()),
+        )
+
+    # get time span of page
+    def get(self, board: str, page: int) -> tuple[datetime, datetime]:
+        row = self.__connection.execute(
+            "SELECT min_time, max_time FROM page_index WHERE board = ? AND page = ?",
+            (board, page),
+        ).fetchone()
+        if row is None:
+            return None
+        return datetime.fromisoformat(row[0]), datetime.fromisoformat(row[1])
+
+    # narrow search range by known pages
+    def narrow(self, board: str, date: datetime, start_index: int, last_index: int) -> tuple[int, int]:
+        """
+        Narrowing page range of a date search with known pages.
+
+        Parameters:
+        board (str): PTT board's name
+        date (datetime): target date
+        start_index (int): lower bound of the search
+        last_index (int): upper bound of the search
+
+        Returns:
+        tuple[int, int]: narrowed lower bound and upper bound
+        """
+        before = self.__connection.execute(
+            "SELECT MAX(page) FROM page_index WHERE board = ? AND max_time < ? AND page BETWEEN ? AND ?",
+            (board, date.isoformat(), start_index, last_index),
+        ).fetchone()[0]
+        after = self.__connection.execute(
+            "SELECT MIN(page) FROM page_index WHERE board = ? AND min_time > ? AND page BETWEEN ? AND ?",
+            (board, date.isoformat(), start_index, last_index),
+        ).fetchone()[0]
+        # the bounding pages stay in range, their spans may still grow at the board's tail
+        return before or start_index, after or last_index
+
+    # close database
+    def close(self) -> None:
+        self.__connection.close()
@@ -0,0 +1,378 @@
+import re
+from collections.abc import Iterable
+
+from lxml import etree
+
+from .decoder import article_id_to_datetime, decode_ip, decode_post_time, decode_push_count, decode_push_datetime
+from .model import IndexEntry
+
+# Parsing functions are kept at module level and exchange plain tuples,
+# so they can run in a worker process of a ProcessPoolExecutor.
+
+# (article_id, title, user_id, user_name, post_time, context, ip_address, comments)
+# comments is list[CommentRecord], or dict of push tag counts if comments="summary"
+ArticleRecord = tuple
+# (tag, user_id, comment_order, context, post_time, ip_address)
+CommentRecord = tuple
+
+# article fields parsers can skip, named as Article.article_field. article_id, board and datetime are always kept
+SELECTABLE_FIELD: frozenset[str] = frozenset({"article_title", "user_id", "user_name", "context", "ip_address"})
+# comments: every push as CommentRecord (True), none (False), or counts of push tags ("summary")
+COMMENT_MODE: tuple = (True, False, "summary")
+PUSH_TAGS: tuple[str, ...] = ("推", "噓", "→")
+
+
+# get article links and ids from board's index page
+def parse_index_page(content: str, ptt_url: str) -> tuple[list[str], list[str]]:
+    """
+    Get article links and ids from board's index page, on-top articles are excluded.
+
+    Parameters:
+    content (str): index page content
+    ptt_url (str): url prefix of article link
+
+    Returns:
+    list[str]: list of PTT article link
+    list[str]: list of PTT article id
+    """
+    tree = remove_on_top_article(etree.HTML(content))
+    return get_article_links(tree, ptt_url)
+
+
+# get article entries from board's index page
+def parse_index_entries(content: str, ptt_url: str) -> list[IndexEntry]:
+    """
+    Get every article entry (id, link, title, author, date, push count) listed in board's index page.
+    On-top and deleted articles are excluded.
+
+    Parameters:
+    content (str): index page content
+    ptt_url (str): url prefix of article link
+
+    Returns:
+    list[IndexEntry]
+    """
+    tree = remove_on_top_article(etree.HTML(content))
+    entry_xpath = '//*[@id="main-container"]/div[2]/div[@class="r-ent"]'
+    article_id_pattern = r"/bbs/.*?/(.*?)\.html"
+    entries = list()
+    for node in tree.xpath(entry_xpath):
+        links = node.xpath('./div[@class="title"]/a')
+        # deleted article has no link
+        if not links:
+            continue
+        href = links[0].get("href")
+        entries.append(
+            IndexEntry(
+                article_id=re.search(article_id_pattern, href).group(1),
+                link=f"{ptt_url}{href}",
+                title=links[0].text,
+                author="".join(node.xpath('./div[@class="meta"]/div[@class="author"]/text()')),
+                date="".join(node.xpath('./div[@class="meta"]/div[@class="date"]/text()')).strip(),
+                push_count=decode_push_count("".join(node.xpath('./div[@class="nrec"]//text()'))),
+            )
+        )
+    return entries
+
+
+# remove on-top article in etree
+def remove_on_top_article(tree: etree.HTML) -> etree.HTML:
+    """
+    Removing on-top article by detect on-top article separate line in article html div.
+
+    Parameters:
+    tree (etree.HTML)
+
+    Returns:
+    etree.HTML
+    """
+    on_top_article_sep = False
+    article_separate_line_xpath = "r-list-sep"
+    article_xpath = '//*[@id="main-container"]/div[2]/div'
+    # loop all article node and remove on-top articles
+    for node in tree.xpath(article_xpath):
+        # get html div class name
+        class_name = node.get("class")
+
+        # "r-list-sep" means the separate line between normal articles and on-top articles
+        if class_name == article_separate_line_xpath:
+            on_top_article_sep = True
+
+        # remove node if meet the separate line
+        if on_top_article_sep:
+            node.getparent().remove(node)
+
+    # return processed etree
+    return tree
+
+
+# get links from etree
+def get_article_links(tree: etree.HTML, ptt_url: str) -> tuple[list[str], list[str]]:
+    """
+    Get article links from etree by xpath
+
+    Parameters:
+    tree (etree.HTML)
+    ptt_url (str): url prefix of article link
+
+    Returns:
+    list[str]: list of PTT article link
+    list[str]: list of PTT article id
+    """
+    link_xpath = '//*[@id="main-container"]/div[2]/div/div[2]/a'
+    article_id_pattern = r"/bbs/.*?/(.*?)\.html"
+    article_links = list()
+    article_ids = list()
+    # loop and store all article link
+    for node in tree.xpath(link_xpath):
+        href = node.get("href")
+        article_ids.append(re.search(article_id_pattern, href).group(1))
+        article_links.append(f"{ptt_url}{href}")
+
+    # return article links
+    return article_links, article_ids
+
+
+# count push tags
+def summarize_push_tags(push_tags: Iterable[str]) -> dict[str, int]:
+    summary = dict.fromkeys(PUSH_TAGS, 0)
+    for push_tag in push_tags:
+        push_tag = push_tag.strip()
+        summary[push_tag] = summary.get(push_tag, 0) + 1
+    return summary
+
+
+# keep only selected fields, others are None
+def select_fields(record: ArticleRecord, fields: frozenset[str]) -> ArticleRecord:
+    if fields is None:
+        return record
+    article_id, title, user_id, user_name, post_time, context, ip_address, comments = record
+    return (
+        article_id,
+        title if "article_title" in fields else None,
+        user_id if "user_id" in fields else None,
+        user_name if "user_name" in fields else None,
+        post_time,
+        context,
+        ip_address,
+        comments,
+    )
+
+
+# filter article content
+def parse_article(content: str, article_id: str, fields: frozenset[str] = None, comments: bool | str = True) -> ArticleRecord:
+    """
+    Get author, title, post-time, content, comment in article
+
+    Parameters:
+    content (str): PTT article content
+    article_id (str): PTT article id
+    fields (frozenset[str]): fields in SELECTABLE_FIELD to extract, all if None. Unselected fields are None
+    comments (bool | str): one of COMMENT_MODE
+
+    Returns:
+    ArticleRecord: None if article is incomplete
+    """
+    main_content_xpath = '//*[@id="main-content"]'
+
+    article_xpath_dict = {
+        "author": '//*[@id="main-content"]/div[1]',
+        "title": '//*[@id="main-content"]/div[3]',
+        "post_time": '//*[@id="main-content"]/div[4]',
+    }
+    comment_xpath_dict = {
+        "comment": "//div[@class='push']",
+        "push_tag": "//div[@class='push']/span[1]",
+        "push_user_id": "//div[@class='push']/span[2]",
+        "push_content": "//div[@class='push']/span[3]",
+        "push_ip_date_time": "//div[@class='push']/span[4]",
+    }
+    # extract useful information
+    try:
+        lxml_tree = etree.HTML(content).xpath(main_content_xpath)[0]
+
+        article_data = dict()
+        # skip data if it is incomplete.
+        try:
+            for key, value in article_xpath_dict.items():
+                article_data[key] = lxml_tree.xpath(value)[0].xpath("span")[1].text
+        except IndexError as IE:
+            return None
+
+        # get author
+        full_name = article_data["author"][:-1].split(" (")
+        user_id, user_name = full_name[0], full_name[0] if len(full_name) != 2 else full_name[1]
+        # get title
+        title = article_data["title"]
+        # get post date
+        try:
+            post_time = decode_post_time(article_data["post_time"])
+        except ValueError as VE:
+            # fall back to the creation time embedded in article id
+            post_time = article_id_to_datetime(article_id)
+            # skip data if it is incomplete.
+            if post_time is None:
+                return None
+
+        # get comment
+        comment_list = []
+        if comments == "summary":
+            comment_list = summarize_push_tags(push_tag.text for push_tag in lxml_tree.xpath(comment_xpath_dict["push_tag"]))
+        elif comments:
+            comment_data = [
+                range(len(lxml_tree.xpath(comment_xpath_dict["comment"]))),
+                lxml_tree.xpath(comment_xpath_dict["push_tag"]),
+                lxml_tree.xpath(comment_xpath_dict["push_user_id"]),
+                lxml_tree.xpath(comment_xpath_dict["push_content"]),
+                lxml_tree.xpath(comment_xpath_dict["push_ip_date_time"]),
+            ]
+            for idx, push_tag, push_user_id, push_content, push_ip_date_time in zip(*comment_data):
+                _push_tag = push_tag.text.replace(" ", "")
+                _push_user_id = push_user_id.text
+                _push_content = push_content.text[2:] if len(push_content.text) > 2 else ""
+                _push_ip_date_time = push_ip_date_time.text.replace("\n", "")
+                _push_ip = decode_ip(_push_ip_date_time)
+                _push_date_time = decode_push_datetime(_push_ip_date_time, post_time)
+
+                comment_list.append((_push_tag, _push_user_id, idx + 1, _push_content, _push_date_time, _push_ip))
+
+        # get context
+        context = None
+        if fields is None or "context" in fields:
+            # remove all comments, leave only article context
+            delete_flag = False
+            for i in lxml_tree.xpath("./*"):
+                if i.get("class") == "f2":
+                    delete_flag = True
+                if delete_flag:
+                    i.getparent().remove(i)
+            context_xpath = "//div[@class='article-metaline'][3]/following-sibling::text()"
+            context_list = lxml_tree.xpath(context_xpath)
+            # remove all \n, \t
+            context = "".join(map(lambda x: re.sub(r"[\s\t]", "", x), context_list))
+        # get ip
+        ip_address = None
+        if fields is None or "ip_address" in fields:
+            ip_address = decode_ip(content) or ""
+
+        record = (article_id, title, user_id, user_name, post_time, context, ip_address, comment_list)
+        return select_fields(record, fields)
+    except Exception as e:
+        print("Getting article error: ", e)
+        return None
+
+
+# filter article content in one walk over main-content
+def parse_article_single_pass(
+    content: str, article_id: str, fields: frozenset[str] = None, comments: bool | str = True
+) -> ArticleRecord:
+    """
+    Get author, title, post-time, content, comment in article.
+    Same output as parse_article, but main-content's children are visited only once
+    instead of running one XPath query per field.
+    The IP address is the first IP in the page, like parse_article. A push with less than 4 spans is skipped
+    instead of failing the article, parse_article keeps the article too but misaligns the pushes after it.
+
+    Parameters:
+    content (str): PTT article content
+    article_id (str): PTT article id
+    fields (frozenset[str]): fields in SELECTABLE_FIELD to extract, all if None. Unselected fields are None
+    comments (bool | str): one of COMMENT_MODE
+
+    Returns:
+    ArticleRecord: None if article is incomplete
+    """
+    with_context = fields is None or "context" in fields
+    with_ip_address = fields is None or "ip_address" in fields
+    try:
+        main_content = next(etree.HTML(content).iterfind(".//*[@id='main-content']"), None)
+        if main_content is None:
+            return None
+
+        meta_values = list()
+        context_list = list()
+        comment_nodes = list()
+        div_count = 0
+        metaline_count = 0
+        in_context = False
+        removed = False
+        # single walk: metadata divs, context text and pushes
+        for node in main_content:
+            class_name = node.get("class")
+            # everything from the first "f2" node is signature and comments, not context
+            if class_name == "f2":
+                removed = True
+
+            if node.tag == "div":
+                div_count += 1
+                if div_count in (1, 3, 4):
+                    meta_values.append(node)
+                if class_name == "article-metaline":
+                    metaline_count += 1
+                    if metaline_count == 3:
+                        in_context = True
+                if class_name == "push" and comments:
+                    comment_nodes.append(node)
+
+            if with_context and in_context and not removed and node.tail:
+                context_list.append(node.tail)
+
+        # skip data if it is incomplete.
+        if len(meta_values) < 3:
+            return None
+        try:
+            author, title, post_time_text = (node.xpath("span")[1].text for node in meta_values)
+        except IndexError:
+            return None
+
+        # get author
+        full_name = author[:-1].split(" (")
+        user_id, user_name = full_name[0], full_name[0] if len(full_name) != 2 else full_name[1]
+        # get post date
+        try:
+            post_time = decode_post_time(post_time_text)
+        except ValueError:
+            # fall back to the creation time embedded in article id
+            post_time = article_id_to_datetime(article_id)
+            # skip data if it is incomplete.
+            if post_time is None:
+                return None
+
+        # get comment
+        comment_list = list()
+        if comments == "summary":
+            comment_list = summarize_push_tags(node[0].text for node in comment_nodes if len(node) > 0)
+            comment_nodes = list()
+        for idx, node in enumerate(comment_nodes):
+            # skip malformed push
+            if len(node) < 4:
+                continue
+            push_tag, push_user_id, push_content, push_ip_date_time = node[:4]
+            _push_ip_date_time = push_ip_date_time.text.replace("\n", "")
+            comment_list.append(
+                (
+                    push_tag.text.replace(" ", ""),
+                    push_user_id.text,
+                    idx + 1,
+                    push_content.text[2:] if len(push_content.text) > 2 else "",
+                    decode_push_datetime(_push_ip_date_time, post_time),
+                    decode_ip(_push_ip_date_time),
+                )
+            )
+
+        # remove all whitespace in context
+        context = "".join("".join(text.split()) for text in context_list) if with_context else None
+        ip_address = (decode_ip(content) or "") if with_ip_address else None
+
+        record = (article_id, title, user_id, user_name, post_time, context, ip_address, comment_list)
+        return select_fields(record, fields)
+    except Exception as e:
+        print("Getting article error: ", e)
+        return None
+
+
+# article parser engines selectable by name
+ARTICLE_PARSERS: dict[str, callable] = {
+    "xpath": parse_article,
+    "single_pass": parse_article_single_pass,
+}
@@ -1,21 +1,123 @@
 import asyncio
+import json
 import re
+import time
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
 from datetime import datetime, timedelta
 
-import requests
-
+from .cache import ResponseCache
+from .checkpoint import CrawlCheckpoint
+from .columnar_data import ColumnarPTTData
 from .crawler import Crawler
+from .metrics import CrawlMetrics
+from .model import Article
+from .page_index import PageIndex
+from .parser import ARTICLE_PARSERS, COMMENT_MODE, SELECTABLE_FIELD
+from .scheduler import RequestScheduler
+from .sink import Sink
+from .sync_state import BoardSyncState
+from .throttle import RetryPolicy
 from .ptt_data import PTTData
+from .session import SessionManager
 
 
 class AioPTTCrawler:
     # class variable
     PTT_URL: str = "https://www.ptt.cc"
     COOKIES: dict[str:str] = {"over18": "1"}
+    # post time in article page may be a little later than the timestamp in article id
+    ARTICLE_TIME_TOLERANCE: timedelta = timedelta(minutes=10)
 
     # initial PTTCrawler object
-    def __init__(self) -> None:
-        pass
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 50,
+        keepalive_timeout: float = 30,
+        ttl_dns_cache: int = 300,
+        latest_index_ttl: float = 60,
+        page_index_path: str = None,
+        max_requests: int = 50,
+        max_pages: int = None,
+        parser_workers: int = 0,
+        parser_engine: str = "xpath",
+        sync_state_path: str = None,
+        cache: ResponseCache = None,
+        rate_limit: float = None,
+        max_retries: int = 3,
+        request_timeout: float = 30,
+        metrics: CrawlMetrics = None,
+        ptt_url: str = None,
+        checkpoint_path: str = None,
+        fields: set[str] = None,
+        comments: bool | str = True,
+    ) -> None:
+        """
+        Parameters:
+        limit (int): total amount of pooled connections
+        limit_per_host (int): amount of pooled connections to www.ptt.cc
+        keepalive_timeout (float): seconds to keep an idle connection alive
+        ttl_dns_cache (int): seconds to cache DNS lookups
+        latest_index_ttl (float): seconds to cache each board's latest page index
+        page_index_path (str): SQLite file remembering each page's time span, disabled if None
+        max_requests (int): amount of concurrent requests across index pages and articles
+        max_pages (int): amount of pages crawled at the same time across every call of this crawler
+        (ex: all boards of crawl_boards), max_requests if None
+        parser_workers (int): amount of processes parsing HTML, parse on the event loop thread if 0
+        parser_engine (str): article parser, "xpath" or "single_pass"
+        sync_state_path (str): JSON file keeping sync_board's state between runs, kept in memory if None
+        cache (ResponseCache): on-disk response cache, disabled if None
+        rate_limit (float): requests per second to www.ptt.cc, unlimited if None
+        max_retries (int): retries of timeouts, 429 and 5xx responses, with jittered exponential backoff
+        request_timeout (float): seconds before a request is given up
+        metrics (CrawlMetrics): counters and latency histograms of the crawl, CrawlMetrics() if None
+        ptt_url (str): root url of PTT, AioPTTCrawler.PTT_URL if None. ex: a local stand-in server for benchmarks
+        checkpoint_path (str): SQLite file storing finished pages of get_board_articles, so crawls can be resumed, disabled if None
+        fields (set[str]): article fields to extract, others are left None, all if None.
+        Only accept parser.SELECTABLE_FIELD, article_id, board and datetime are always extracted
+        comments (bool | str): parse comments if True, skip them if False,
+        or "summary" to count push tags into Article.comment_summary without building comments
+
+        Returns:
+        None
+        """
+        if parser_engine not in ARTICLE_PARSERS:
+            raise ValueError(f"Unknown parser engine: <{parser_engine}>. Only accept {list(ARTICLE_PARSERS)}.")
+        self.parser_engine = parser_engine
+        if fields is not None and not SELECTABLE_FIELD.issuperset(fields):
+            raise ValueError(f"Unknown fields: <{set(fields) - SELECTABLE_FIELD}>. Only accept {sorted(SELECTABLE_FIELD)}.")
+        if comments not in COMMENT_MODE:
+            raise ValueError(f"Unknown comments mode: <{comments}>. Only accept {list(COMMENT_MODE)}.")
+        self.fields = frozenset(fields) if fields is not None else None
+        self.comments = comments
+        # parse settings changing crawled data, pages are checkpointed with them
+        self.__checkpoint_settings = json.dumps({"fields": sorted(self.fields) if fields is not None else None, "comments": comments})
+        self.ptt_url = ptt_url if ptt_url is not None else AioPTTCrawler.PTT_URL
+        self.latest_index_ttl = latest_index_ttl
+        self.__latest_index_cache: dict[str, tuple[int, float]] = dict()
+        self.page_index = PageIndex(page_index_path) if page_index_path else None
+        self.checkpoint = CrawlCheckpoint(checkpoint_path) if checkpoint_path else None
+        self.sync_state = BoardSyncState(sync_state_path)
+        self.metrics = metrics if metrics is not None else CrawlMetrics()
+        self.session_manager = SessionManager(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=ttl_dns_cache,
+            cache=cache,
+            request_timeout=request_timeout,
+            metrics=self.metrics,
+        )
+        self.scheduler = RequestScheduler(self.session_manager, max_requests, rate_limit, RetryPolicy(max_retries))
+        self.parser_executor = ProcessPoolExecutor(max_workers=parser_workers) if parser_workers > 0 else None
+        # page budget shared by every crawl, created on the running loop
+        self.max_pages = max_pages if max_pages is not None else max_requests
+        self.__page_semaphore: asyncio.Semaphore = None
+        self.__page_semaphore_loop: asyncio.AbstractEventLoop = None
+        # private loop of the blocking methods, created on first use
+        self.event_loop: asyncio.AbstractEventLoop = None
 
     # get newest pages from ptt board
     def get_board_latest_articles(self, board: str, page_count: int = 10) -> PTTData:
@@ -29,16 +131,87 @@ class AioPTTCrawler:
         Returns:
         PTTData: custom class to store data from PTT
         """
+        return self._run("get_board_latest_articles", self.aget_board_latest_articles(board, page_count))
+
+    # get newest pages from ptt board (coroutine)
+    async def aget_board_latest_articles(self, board: str, page_count: int = 10) -> PTTData:
         # get latest page number
-        end_index = self.get_latest_index(board)
+        end_index = await self.aget_latest_index(board)
         # calculate start page number
         start_index = end_index - page_count + 1
 
         # return PTTData
-        return self.get_board_articles(board, start_index, end_index)
+        return await self.aget_board_articles(board, start_index, end_index)
+
+    # get new and changed articles in newest pages
+    def sync_board(self, board: str, page_count: int = 10) -> PTTData:
+        """
+        Getting only articles in the newest pages which are new, or whose push count changed, since the last sync of board.
+        Push count is read from index page, so changes of articles over 99 pushes ("爆") can't be detected.
+
+        Parameters:
+        board (str): PTT board's name
+        page_count (int): amount of pages.
+
+        Returns:
+        PTTData: new and changed articles, urls which couldn't be fetched (index pages too) are reported by get_failure()
+        """
+        return self._run("sync_board", self.async_sync_board(board, page_count))
+
+    # get new and changed articles in newest pages (coroutine)
+    async def async_sync_board(self, board: str, page_count: int = 10) -> PTTData:
+        end_index = await self.aget_latest_index(board)
+        start_index = max(1, end_index - page_count + 1)
+        crawlers = [self._create_crawler(board, i) for i in range(start_index, end_index + 1)]
+
+        # read push count of every article from index pages, a failed page is skipped
+        ptt_data = PTTData()
+        index_results = await asyncio.gather(*[crawler.get_index_entries() for crawler in crawlers], return_exceptions=True)
+        page_entries: list[list] = list()
+        for crawler, result in zip(crawlers, index_results):
+            if isinstance(result, Exception):
+                url = f"{self.ptt_url}/bbs/{board}/index{crawler.page_number}.html"
+                print(f"{board}: getting {url} error. {result}")
+                ptt_data.add_failure(url, result)
+                result = list()
+            page_entries.append(result)
+        failed_page = len(ptt_data.get_failure()) > 0
+
+        # fetch only new and changed articles
+        tasks = list()
+        for crawler, entries in zip(crawlers, page_entries):
+            changed_entries = self.sync_state.get_changed_entries(board, entries)
+            if changed_entries:
+                tasks.append(
+                    crawler.get_articles_data([entry.link for entry in changed_entries], [entry.article_id for entry in changed_entries])
+                )
+        results: list[PTTData] = await asyncio.gather(*tasks)
+
+        for sub_ptt_data in results:
+            ptt_data.update(sub_ptt_data)
+
+        # remember push count, articles which couldn't be fetched will be fetched again next time.
+        # articles fetched but not parsed (ex: no header) are remembered, or they would be fetched on every sync.
+        # articles on failed index pages keep their previous state
+        all_entries = [entry for entries in page_entries for entry in entries]
+        failed_links = ptt_data.get_failure()
+        failed_article_ids = {entry.article_id for entry in all_entries if entry.link in failed_links}
+        self.sync_state.update(board, all_entries, failed_article_ids, partial=failed_page)
+        self.sync_state.save()
+
+        return ptt_data
 
     # get articles by range of index
-    def get_board_articles(self, board: str, start_index: int, end_index: int, show_progress=True) -> PTTData:
+    def get_board_articles(
+        self,
+        board: str,
+        start_index: int,
+        end_index: int,
+        show_progress=True,
+        columnar: bool = False,
+        resume: bool = False,
+        time_range: tuple[datetime, datetime] = None,
+    ) -> PTTData | ColumnarPTTData:
         """
         Getting PTT board's articles with amount of pages.
 
@@ -46,91 +219,487 @@ class AioPTTCrawler:
         board (str): PTT board's name
         start_index (int): start index.
         end_index (int): end index.
+        columnar (bool): store data column-wise in ColumnarPTTData, for large crawls exported as DataFrame
+        resume (bool): load pages finished by an earlier crawl from checkpoint instead of fetching them again,
+        only works with checkpoint_path
+        time_range (tuple[datetime, datetime]): only fetch articles whose article id timestamp is in (start_time, end_time),
+        pages crawled with it are never checkpointed
 
         Returns:
-        PTTData: custom class to store data from PTT
+        PTTData | ColumnarPTTData: custom class to store data from PTT
         """
-
-        # create async event loop
-        self.event_loop = asyncio.get_event_loop()
-
+        return self._run(
+            "get_board_articles",
+            self.aget_board_articles(board, start_index, end_index, show_progress, columnar, resume, time_range),
+        )
+
+    # get articles by range of index (coroutine)
+    async def aget_board_articles(
+        self,
+        board: str,
+        start_index: int,
+        end_index: int,
+        show_progress=True,
+        columnar: bool = False,
+        resume: bool = False,
+        time_range: tuple[datetime, datetime] = None,
+    ) -> PTTData | ColumnarPTTData:
         # ensure index won't out of boundary
+        latest_index = await self.aget_latest_index(board)
         start_index = max(1, start_index)
-        end_index = min(self.get_latest_index(board), end_index)
+        end_index = min(latest_index, end_index)
+
+        # pages finished by an earlier crawl
+        finished_pages = set()
+        if resume and self.checkpoint is not None and time_range is None:
+            finished_pages = self.checkpoint.get_finished_pages(board, start_index, end_index, columnar, self.__checkpoint_settings)
 
         if show_progress:
             print(f"Start to crawl page {start_index} ~ {end_index}")
+            if finished_pages:
+                print(f"Resume from checkpoint, skip {len(finished_pages)} finished pages")
 
-        sem = asyncio.Semaphore(50)
+        sem = self.__get_page_semaphore()
 
         # list all crawler
-        crawlers = [Crawler(board, i) for i in range(start_index, end_index + 1)]
+        crawlers = [
+            self._create_crawler(board, i, columnar, time_range)
+            for i in range(start_index, end_index + 1)
+            if i not in finished_pages
+        ]
         # list all tasks
-        tasks = [crawler.get_specific_page_data(sem, show_progress) for crawler in crawlers]
+        tasks = [self.__get_page_data(crawler, sem, show_progress, latest_index) for crawler in crawlers]
 
         # run tasks and get the results
-        results: list[PTTData] = self.event_loop.run_until_complete(asyncio.gather(*tasks))
+        results: dict[int, PTTData] = dict(zip((crawler.page_number for crawler in crawlers), await asyncio.gather(*tasks)))
 
         # release memory
         del crawlers, tasks
 
+        # merge in page order
+        ptt_data = ColumnarPTTData() if columnar else PTTData()
+        for page_number in range(start_index, end_index + 1):
+            if page_number in finished_pages:
+                ptt_data.update(self.checkpoint.get(board, page_number, columnar, self.__checkpoint_settings))
+            else:
+                ptt_data.update(results.pop(page_number))
+        return ptt_data
+
+    # crawl page and flush it into checkpoint
+    async def __get_page_data(
+        self, crawler: Crawler, sem: asyncio.Semaphore, show_progress: bool, latest_index: int
+    ) -> PTTData | ColumnarPTTData:
+        ptt_data = await crawler.get_specific_page_data(sem, show_progress)
+        # latest page still grows and time-filtered pages are partial, they are never finished
+        if self.checkpoint is not None and crawler.page_number < latest_index and crawler.time_range is None:
+            self.checkpoint.put(crawler.board, crawler.page_number, ptt_data, self.__checkpoint_settings)
+        return ptt_data
+
+    # get article stubs by range of index, read from listings only
+    def get_board_listing(self, board: str, start_index: int, end_index: int, show_progress=False) -> PTTData:
+        """
+        Getting PTT board's article stubs (id, title, author, post time and push count) from index pages only,
+        without downloading any article. Load content and comments of selected stubs later by hydrate().
+
+        Parameters:
+        board (str): PTT board's name
+        start_index (int): start index.
+        end_index (int): end index.
+
+        Returns:
+        PTTData: article stubs, without comments
+        """
+        return self._run("get_board_listing", self.aget_board_listing(board, start_index, end_index, show_progress))
+
+    # get article stubs by range of index, read from listings only (coroutine)
+    async def aget_board_listing(self, board: str, start_index: int, end_index: int, show_progress=False) -> PTTData:
+        # ensure index won't out of boundary
+        start_index = max(1, start_index)
+        end_index = min(await self.aget_latest_index(board), end_index)
+
+        sem = self.__get_page_semaphore()
+        crawlers = [self._create_crawler(board, i) for i in range(start_index, end_index + 1)]
+        results: list[PTTData] = await asyncio.gather(*[crawler.get_listing_data(sem, show_progress) for crawler in crawlers])
+
         ptt_data = PTTData()
         for sub_ptt_data in results:
-            if sub_ptt_data:
-                ptt_data.update(sub_ptt_data)
+            ptt_data.update(sub_ptt_data)
         return ptt_data
 
+    # get articles by id
+    def fetch_articles(self, board: str, article_ids: list[str]) -> PTTData:
+        """
+        Getting PTT board's articles (with their comments) by article id.
+
+        Parameters:
+        board (str): PTT board's name
+        article_ids (list[str]): list of PTT article id
+
+        Returns:
+        PTTData: urls which couldn't be fetched are reported by get_failure()
+        """
+        return self._run("fetch_articles", self.afetch_articles(board, article_ids))
+
+    # get articles by id (coroutine)
+    async def afetch_articles(self, board: str, article_ids: list[str]) -> PTTData:
+        article_links = [f"{self.ptt_url}/bbs/{board}/{article_id}.html" for article_id in article_ids]
+        return await self._create_crawler(board, 0).get_articles_data(article_links, article_ids)
+
+    # load content and comments of article stubs
+    def hydrate(self, ptt_data: PTTData, article_ids: list[str] = None) -> None:
+        """
+        Replacing article stubs in ptt_data with full articles and their comments, see PTTData.fetch_content.
+
+        Parameters:
+        ptt_data (PTTData): data holding article stubs, ex: from get_board_listing
+        article_ids (list[str]): stubs to load, every stub if None
+
+        Returns:
+        None
+        """
+        self._run("hydrate", self.ahydrate(ptt_data, article_ids))
+
+    # load content and comments of article stubs (coroutine)
+    async def ahydrate(self, ptt_data: PTTData, article_ids: list[str] = None) -> None:
+        await ptt_data.fetch_content(self, article_ids)
+
+    # get articles of many boards at the same time
+    def crawl_boards(
+        self,
+        boards: dict[str, tuple[int, int] | tuple[datetime, datetime]],
+        show_progress=False,
+        columnar: bool = False,
+    ) -> dict[str, PTTData | ColumnarPTTData]:
+        """
+        Getting articles of many boards in one run. All boards share the connection pool and `max_requests`,
+        and requests are served round-robin across boards, so small boards don't wait behind large ones.
+
+        Parameters:
+        boards (dict[str, tuple[int, int] | tuple[datetime, datetime]]): board's name to its page range (start_index, end_index)
+        or date range (start_time, end_time). ex: {"Gossiping": (39000, 39100), "Baseball": (datetime(2022, 10, 1), datetime(2022, 10, 2))}
+        columnar (bool): store page ranges' data in ColumnarPTTData, date ranges always return PTTData
+
+        Returns:
+        dict[str, PTTData | ColumnarPTTData]: board's name to its data
+        """
+        return self._run("crawl_boards", self.acrawl_boards(boards, show_progress, columnar))
+
+    # get articles of many boards at the same time (coroutine)
+    async def acrawl_boards(
+        self,
+        boards: dict[str, tuple[int, int] | tuple[datetime, datetime]],
+        show_progress=False,
+        columnar: bool = False,
+    ) -> dict[str, PTTData | ColumnarPTTData]:
+        tasks = list()
+        for board, (start, end) in boards.items():
+            if isinstance(start, datetime) and isinstance(end, datetime):
+                tasks.append(self.aget_article_by_datetime(board, start, end))
+            elif isinstance(start, int) and isinstance(end, int):
+                tasks.append(self.aget_board_articles(board, start, end, show_progress, columnar))
+            else:
+                raise TypeError(f"Can't crawl {board} by ({type(start)}, {type(end)}). Only accept page range or datetime range.")
+        results = await asyncio.gather(*tasks)
+        return dict(zip(boards, results))
+
+    # stream articles by range of index
+    async def iter_board_articles(
+        self,
+        board: str,
+        start_index: int,
+        end_index: int,
+        max_pages_in_flight: int = 10,
+        show_progress=False,
+        failure_dict: dict[str, str] = None,
+    ) -> AsyncIterator[Article]:
+        """
+        Streaming PTT board's articles (with their comments) as soon as each page is finished.
+        At most `max_pages_in_flight` pages are crawled at the same time, and no new page is started
+        until the consumer asks for more, so memory stays flat on long crawls.
+        Articles are yielded in page completion order.
+
+        Parameters:
+        board (str): PTT board's name
+        start_index (int): start index.
+        end_index (int): end index.
+        max_pages_in_flight (int): amount of pages of this stream crawled concurrently, also bounded by max_pages
+        failure_dict (dict[str, str]): filled with failed url and its error message as each page finishes, ignored if None
+
+        Returns:
+        AsyncIterator[Article]
+        """
+        # close the page stream with this generator, so unfinished pages are dropped at once
+        async with aclosing(self.__iter_page_data(board, start_index, end_index, max_pages_in_flight, show_progress)) as pages:
+            async for ptt_data in pages:
+                if failure_dict is not None:
+                    failure_dict.update(ptt_data.get_failure())
+                for article in ptt_data.get_article():
+                    yield article
+
+    # write articles into sink as each page finishes
+    def crawl_to_sink(
+        self, board: str, start_index: int, end_index: int, sink: Sink, max_pages_in_flight: int = 10, show_progress=False
+    ) -> dict[str, str]:
+        """
+        Writing PTT board's articles and comments into sink page by page, so the crawl is never held in memory.
+        The sink is flushed at the end but not closed.
+
+        Parameters:
+        board (str): PTT board's name
+        start_index (int): start index.
+        end_index (int): end index.
+        sink (Sink): JSONLSink, SQLiteSink, ParquetSink or other Sink
+        max_pages_in_flight (int): amount of pages of this stream crawled concurrently, also bounded by max_pages
+
+        Returns:
+        dict[str, str]: failed url and its error message
+        """
+        return self._run(
+            "crawl_to_sink", self.acrawl_to_sink(board, start_index, end_index, sink, max_pages_in_flight, show_progress)
+        )
+
+    # write articles into sink as each page finishes (coroutine)
+    async def acrawl_to_sink(
+        self, board: str, start_index: int, end_index: int, sink: Sink, max_pages_in_flight: int = 10, show_progress=False
+    ) -> dict[str, str]:
+        failure_dict = dict()
+        async with aclosing(self.__iter_page_data(board, start_index, end_index, max_pages_in_flight, show_progress)) as pages:
+            async for ptt_data in pages:
+                for article in ptt_data.get_article():
+                    sink.write(article)
+                failure_dict.update(ptt_data.get_failure())
+        sink.flush()
+        return failure_dict
+
+    # stream data of each page by range of index
+    async def __iter_page_data(
+        self, board: str, start_index: int, end_index: int, max_pages_in_flight: int, show_progress: bool
+    ) -> AsyncIterator[PTTData]:
+        # ensure index won't out of boundary
+        start_index = max(1, start_index)
+        end_index = min(await self.aget_latest_index(board), end_index)
+
+        sem = self.__get_page_semaphore()
+        page_numbers = iter(range(start_index, end_index + 1))
+        pending = set()
+        try:
+            while True:
+                # refill in-flight pages
+                for page_number in page_numbers:
+                    crawler = self._create_crawler(board, page_number)
+                    pending.add(asyncio.ensure_future(crawler.get_specific_page_data(sem, show_progress)))
+                    if len(pending) >= max_pages_in_flight:
+                        break
+                if not pending:
+                    break
+
+                # yield every finished page
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # consumer stopped early, drop unfinished pages
+            for task in pending:
+                task.cancel()
+
     # get latest page index from ptt board
     def get_latest_index(self, board: str) -> int:
+        return self._run("get_latest_index", self.aget_latest_index(board))
+
+    # get latest page index from ptt board (coroutine)
+    async def aget_latest_index(self, board: str) -> int:
+        """
+        Getting latest page index of board. The result is cached for `latest_index_ttl` seconds,
+        so repeated lookups during one crawl or date search don't re-fetch index.html.
+
+        Parameters:
+        board (str): PTT board's name
+
+        Returns:
+        int: latest page index
+        """
+        # fail fast on another event loop, cached index would skip the scheduler
+        self.scheduler.start()
+        # use cached index if it is still fresh.
+        cached = self.__latest_index_cache.get(board)
+        if cached is not None and time.monotonic() - cached[1] < self.latest_index_ttl:
+            return cached[0]
+
         # board's index.html always point to the newest page.
-        content = requests.get(
-            url=f"{AioPTTCrawler.PTT_URL}/bbs/{board}/index.html",
-            cookies=AioPTTCrawler.COOKIES,
-        ).content.decode("utf-8")
+        content = await self.scheduler.fetch(f"{self.ptt_url}/bbs/{board}/index.html", group=board)
 
         # search for the previous page number.
-        previous_page = re.search(f'href="/bbs/{board}/index(\d+).html">&lsaquo;', content)
+        previous_page = re.search(f'href="/bbs/{board}/index(\\d+).html">&lsaquo;', content)
 
         # check if there is latest page in this board.
         if previous_page is None:
             raise ValueError(f"Can't get board:<{board}>'s latest page index.")
 
-        # return latest page number
-        return int(previous_page.group(1)) + 1
+        # cache and return latest page number
+        latest_index = int(previous_page.group(1)) + 1
+        self.__latest_index_cache[board] = (latest_index, time.monotonic())
+        return latest_index
 
     # get article by datetime range
-    def get_article_by_datetime(self, board: str, start_time: datetime, end_time: datetime) -> PTTData:
-        start_time = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_time = end_time.replace(hour=23, minute=59, second=59, microsecond=0)
+    def get_article_by_datetime(self, board: str, start_time: datetime, end_time: datetime, exact: bool = False) -> PTTData:
+        """
+        Getting PTT board's articles posted in datetime range. Pages holding the range are found by binary search on listings,
+        and only articles whose article id timestamp is in the range are fetched.
+
+        Parameters:
+        board (str): PTT board's name
+        start_time (datetime): start of range, from 00:00:00 of its day unless exact
+        end_time (datetime): end of range (included), to 23:59:59 of its day unless exact
+        exact (bool): use start_time and end_time as they are instead of whole days
+
+        Returns:
+        PTTData: articles sorted by post time
+        """
+        return self._run("get_article_by_datetime", self.aget_article_by_datetime(board, start_time, end_time, exact))
+
+    # get article by datetime range (coroutine)
+    async def aget_article_by_datetime(self, board: str, start_time: datetime, end_time: datetime, exact: bool = False) -> PTTData:
+        if not exact:
+            start_time = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+            end_time = end_time.replace(hour=23, minute=59, second=59, microsecond=0)
 
         print("Start to find target date range")
-        start_index = self._search_page_date(board, start_time - timedelta(days=1))
-        end_index = self._search_page_date(board, end_time + timedelta(days=1))
+        # search both boundaries at the same time
+        start_index, end_index = await asyncio.gather(
+            self._asearch_page_time(board, start_time - AioPTTCrawler.ARTICLE_TIME_TOLERANCE),
+            self._asearch_page_time(board, end_time + AioPTTCrawler.ARTICLE_TIME_TOLERANCE),
+        )
         print(f"Found target date range. roughly location in {start_index} ~ {end_index}")
 
-        ptt_data = self.get_board_articles(board, start_index, end_index, show_progress=False)
+        time_range = (start_time - AioPTTCrawler.ARTICLE_TIME_TOLERANCE, end_time + AioPTTCrawler.ARTICLE_TIME_TOLERANCE)
+        ptt_data = await self.aget_board_articles(board, start_index, end_index, show_progress=False, time_range=time_range)
 
         print("Filter and sort article by date")
         ptt_data.delete_data_by_date(start_time, end_time)
 
         return ptt_data
 
-    def _search_page_date(self, board: str, date: datetime) -> int:
+    # find page holding articles posted at target time
+    async def _asearch_page_time(self, board: str, target: datetime) -> int:
+        """
+        Binary searching the last page whose first article is posted before or at target, by reading listings only.
+
+        Parameters:
+        board (str): PTT board's name
+        target (datetime): target time
+
+        Returns:
+        int: page number, the first searched page if every page is posted after target
+        """
         start_index = 1
-        last_index = self.get_latest_index(board)
+        last_index = await self.aget_latest_index(board)
+        # use known pages to narrow the search
+        if self.page_index is not None:
+            start_index, last_index = self.page_index.narrow(board, target, start_index, last_index)
+        found_index = start_index
         while start_index <= last_index:
             mid = (start_index + last_index) // 2
-            ptt_data = self.get_board_articles(board, mid, mid, show_progress=False)
-            date_list = ptt_data.get_date_from_article()
-            # print(start_time, end_time, mid, date_list)
-            if date > date_list[0]:
-                start_index = mid + 1
-            elif date < date_list[0]:
+            # probe listing page only, skip forward if every article on it was deleted
+            probe = mid
+            timestamps = await self._create_crawler(board, probe).get_page_timestamps()
+            while not timestamps and probe < last_index:
+                probe += 1
+                timestamps = await self._create_crawler(board, probe).get_page_timestamps()
+            if not timestamps:
                 last_index = mid - 1
+                continue
+
+            if min(timestamps) <= target:
+                found_index = probe
+                start_index = probe + 1
             else:
-                break
-        return mid
+                last_index = mid - 1
+        return found_index
+
+    # get semaphore of the shared page budget
+    def __get_page_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self.__page_semaphore is None or self.__page_semaphore_loop is not loop:
+            self.__page_semaphore = asyncio.Semaphore(self.max_pages)
+            self.__page_semaphore_loop = loop
+        return self.__page_semaphore
+
+    # create Crawler sharing this crawler's resources
+    def _create_crawler(
+        self, board: str, page_number: int, columnar: bool = False, time_range: tuple[datetime, datetime] = None
+    ) -> Crawler:
+        # raise on another event loop here, instead of recording every request as failed
+        self.scheduler.start()
+        return Crawler(
+            board,
+            page_number,
+            self.scheduler,
+            self.page_index,
+            self.parser_executor,
+            self.parser_engine,
+            columnar,
+            self.ptt_url,
+            time_range,
+            self.fields,
+            self.comments,
+        )
+
+    # close pooled connections and parser processes
+    def close(self) -> None:
+        self._run("close", self.aclose())
+        self.event_loop.close()
+
+    # close pooled connections and parser processes (coroutine)
+    async def aclose(self) -> None:
+        await self.scheduler.close()
+        await self.session_manager.close()
+        if self.page_index is not None:
+            self.page_index.close()
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+        if self.session_manager.cache is not None:
+            self.session_manager.cache.close()
+        if self.parser_executor is not None:
+            self.parser_executor.shutdown()
+
+    def __enter__(self) -> "AioPTTCrawler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "AioPTTCrawler":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    # run coroutine on the crawler's private event loop
+    def _run(self, name: str, coroutine):
+        """
+        Running coroutine to the end for the blocking methods.
+
+        Parameters:
+        name (str): name of the blocking method, ex: "get_board_articles"
+        coroutine: coroutine of the same method, ex: self.aget_board_articles(...)
 
+        Returns:
+        result of coroutine
+
+        Raises:
+        RuntimeError: called inside a running event loop, await the coroutine method instead
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            coroutine_name = coroutine.__qualname__.rsplit(".", 1)[-1]
+            coroutine.close()
+            raise RuntimeError(f"{name}() can't be called inside a running event loop, use `await {coroutine_name}()` instead.")
+        if self.event_loop is None or self.event_loop.is_closed():
+            self.event_loop = asyncio.new_event_loop()
+        return self.event_loop.run_until_complete(coroutine)
 
 def main():
     BOARD = "Gossiping"
@@ -138,6 +707,7 @@ def main():
     ptt_data = ptt_crawler.get_board_latest_articles(board=BOARD, page_count=100)
     d = ptt_data.get_article_dict()
     print(d)
+    ptt_crawler.close()
 
 
 if __name__ == "__main__":
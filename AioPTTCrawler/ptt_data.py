@@ -1,3 +1,6 @@
+import asyncio
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable
 from datetime import datetime
 
 import pandas as pd
@@ -10,11 +13,25 @@ class PTTData:
     def __init__(self) -> None:
         self.__article_list: list[Article] = list()
         self.__comment_list: list[Comment] = list()
+        self.__failure_dict: dict[str, str] = dict()
+        # indexes of articles, kept up to date on append
+        self.__article_id_index: dict[str, Article] = dict()
+        self.__user_id_index: dict[str, list[Article]] = dict()
+        # position of each article and comment in list, used to upsert them
+        self.__article_position: dict[str, int] = dict()
+        self.__comment_position: dict[tuple[str, int], int] = dict()
+        # articles sorted by post time and their post time, rebuilt lazily after append
+        self.__time_sorted_article: list[Article] = None
+        self.__time_sorted_post_time: list[datetime] = None
 
     # append data into list
     def append(self, obj: Article | Comment) -> None:
         """
-        append data into PTTData, only accept Article and Comment object
+        append data into PTTData, only accept Article and Comment object.
+        Data is upserted: an article with known article_id, or a comment with known (article_id, comment_order),
+        replaces the stored one in place instead of being added again.
+        An article only replaces the stored one if its comment list isn't shorter, so the newest push list is kept,
+        and a listing-only stub never replaces a full article. Comments of the kept article are stored with it.
 
         Parameters:
         obj (Article | Comment): data need to be append
@@ -24,21 +41,230 @@ class PTTData:
         """
         # check obj's instance
         if isinstance(obj, Article):
-            self.__article_list.append(obj)
+            self.__upsert_article(obj)
         elif isinstance(obj, Comment):
-            self.__comment_list.append(obj)
+            self.__upsert_comment(obj)
         else:
             raise TypeError(f"Can't append {type(obj)}. Only accept <class 'Article'> or <class 'Comment'>.")
 
+    # add article or replace the stored one with the same article_id
+    def __upsert_article(self, article: Article) -> None:
+        position = self.__article_position.get(article.article_id)
+        if position is None:
+            self.__article_position[article.article_id] = len(self.__article_list)
+            self.__article_list.append(article)
+            self.__index_article(article)
+            self.__replace_comments(article, ())
+            return
+
+        stored_article = self.__article_list[position]
+        # a stub has no content, it never replaces a full article
+        if article.is_stub and not stored_article.is_stub:
+            return
+        # pushes are only added to an article, so the longer push list is the newer one
+        if article.is_stub == stored_article.is_stub and len(article.comment_list) < len(stored_article.comment_list):
+            return
+        self.__article_list[position] = article
+        user_articles = self.__user_id_index[stored_article.user_id]
+        del user_articles[next(i for i, user_article in enumerate(user_articles) if user_article is stored_article)]
+        self.__index_article(article)
+        self.__replace_comments(article, stored_article.comment_list)
+
+    # make stored comments of article the same as its comment list
+    def __replace_comments(self, article: Article, stored_comments: list[Comment]) -> None:
+        for comment in article.comment_list:
+            self.__upsert_comment(comment)
+        comment_orders = {comment.comment_order for comment in article.comment_list}
+        stale_positions = {
+            self.__comment_position.pop((article.article_id, comment.comment_order))
+            for comment in stored_comments
+            if comment.comment_order not in comment_orders
+            and (article.article_id, comment.comment_order) in self.__comment_position
+        }
+        if stale_positions:
+            self.__comment_list = [comment for i, comment in enumerate(self.__comment_list) if i not in stale_positions]
+            self.__comment_position = {
+                (comment.article_id, comment.comment_order): i for i, comment in enumerate(self.__comment_list)
+            }
+
+    # add comment or replace the stored one with the same article_id and comment_order
+    def __upsert_comment(self, comment: Comment) -> None:
+        key = (comment.article_id, comment.comment_order)
+        position = self.__comment_position.get(key)
+        if position is None:
+            self.__comment_position[key] = len(self.__comment_list)
+            self.__comment_list.append(comment)
+        else:
+            self.__comment_list[position] = comment
+
+    # add article into indexes
+    def __index_article(self, article: Article) -> None:
+        self.__article_id_index[article.article_id] = article
+        self.__user_id_index.setdefault(article.user_id, list()).append(article)
+        self.__time_sorted_article = None
+        self.__time_sorted_post_time = None
+
+    # rebuild all indexes from article list and comment list, they must be unique
+    def __rebuild_index(self) -> None:
+        self.__article_id_index = dict()
+        self.__user_id_index = dict()
+        self.__article_position = {article.article_id: i for i, article in enumerate(self.__article_list)}
+        self.__comment_position = {(comment.article_id, comment.comment_order): i for i, comment in enumerate(self.__comment_list)}
+        for article in self.__article_list:
+            self.__index_article(article)
+
+    # build articles sorted by post time, articles without post time are left out
+    def __get_time_index(self) -> tuple[list[Article], list[datetime]]:
+        if self.__time_sorted_article is None:
+            self.__time_sorted_article = sorted(
+                (article for article in self.__article_list if article.post_time is not None), key=lambda x: x.post_time
+            )
+            self.__time_sorted_post_time = [article.post_time for article in self.__time_sorted_article]
+        return self.__time_sorted_article, self.__time_sorted_post_time
+
+    # create PTTData sharing articles and their comments, without copying them
+    @staticmethod
+    def __create_view(articles: list[Article]) -> "PTTData":
+        view = PTTData()
+        view.__article_list = articles
+        view.__comment_list = [comment for article in articles for comment in article.comment_list]
+        view.__rebuild_index()
+        return view
+
+    # get article by its id
+    def get_article_by_id(self, article_id: str) -> Article:
+        return self.__article_id_index.get(article_id)
+
+    # get articles posted by user
+    def get_article_by_user(self, user_id: str) -> list[Article]:
+        return list(self.__user_id_index.get(user_id, list()))
+
+    # get articles posted in time range
+    def get_article_by_time(self, start_time: datetime = None, end_time: datetime = None) -> list[Article]:
+        """
+        Getting articles posted between start_time and end_time (both included) by binary search on post time.
+
+        Parameters:
+        start_time (datetime): lower bound, unbounded if None
+        end_time (datetime): upper bound, unbounded if None
+
+        Returns:
+        list[Article]: articles sorted by post time
+        """
+        articles, post_times = self.__get_time_index()
+        start = 0 if start_time is None else bisect_left(post_times, start_time)
+        end = len(post_times) if end_time is None else bisect_right(post_times, end_time)
+        return articles[start:end]
+
+    # get view of articles matching all conditions
+    def query(
+        self,
+        start_time: datetime = None,
+        end_time: datetime = None,
+        user_id: str = None,
+        article_id: str | list[str] = None,
+    ) -> "PTTData":
+        """
+        Getting a PTTData of articles (with their comments) matching all given conditions.
+        Candidates are looked up by index, so the whole data isn't scanned. Articles and comments are shared, not copied.
+
+        Parameters:
+        start_time (datetime): post time lower bound (included)
+        end_time (datetime): post time upper bound (included)
+        user_id (str): author's id
+        article_id (str | list[str]): article id or list of article id
+
+        Returns:
+        PTTData: sorted by post time if start_time or end_time is given, else in original order
+        """
+        if isinstance(article_id, str):
+            article_id = [article_id]
+
+        if article_id is not None:
+            candidates = [self.__article_id_index[i] for i in dict.fromkeys(article_id) if i in self.__article_id_index]
+        elif user_id is not None:
+            candidates = self.__user_id_index.get(user_id, list())
+        else:
+            candidates = self.__article_list
+
+        if start_time is not None or end_time is not None:
+            # narrow candidates by binary search when time range is the only condition
+            if candidates is self.__article_list:
+                candidates = self.get_article_by_time(start_time, end_time)
+            else:
+                candidates = sorted(
+                    (
+                        article
+                        for article in candidates
+                        if article.post_time is not None
+                        and (start_time is None or article.post_time >= start_time)
+                        and (end_time is None or article.post_time <= end_time)
+                    ),
+                    key=lambda x: x.post_time,
+                )
+        if user_id is not None:
+            candidates = [article for article in candidates if article.user_id == user_id]
+
+        return PTTData.__create_view(list(candidates))
+
+    # get view of articles passing function
+    def filter(self, function: Callable[[Article], bool]) -> "PTTData":
+        """
+        Getting a PTTData of articles (with their comments) passing function. Articles and comments are shared, not copied.
+
+        Parameters:
+        function (Callable[[Article], bool]): condition of article
+
+        Returns:
+        PTTData
+        """
+        return PTTData.__create_view([article for article in self.__article_list if function(article)])
+
+    # get articles which are listing-only stubs
+    def get_stub_article(self) -> list[Article]:
+        return [article for article in self.__article_list if article.is_stub]
+
+    # fetch content and comments of article stubs
+    async def fetch_content(self, ptt_crawler, article_ids: list[str] = None) -> None:
+        """
+        Fetching full articles (content, ip address and comments) of stubs and upserting them in place.
+        Push count read from listing is kept. Urls which couldn't be fetched are reported by get_failure().
+
+        Parameters:
+        ptt_crawler (AioPTTCrawler): crawler used to fetch articles
+        article_ids (list[str]): articles to fetch, every stub if None
+
+        Returns:
+        None
+        """
+        if article_ids is None:
+            articles = self.get_stub_article()
+        else:
+            articles = [self.__article_id_index[i] for i in dict.fromkeys(article_ids) if i in self.__article_id_index]
+
+        # fetch each board's articles at the same time
+        board_article_ids: dict[str, list[str]] = dict()
+        for article in articles:
+            board_article_ids.setdefault(article.board, list()).append(article.article_id)
+        results: list[PTTData] = await asyncio.gather(
+            *[ptt_crawler.afetch_articles(board, ids) for board, ids in board_article_ids.items()]
+        )
+
+        for result in results:
+            for article in result.get_article():
+                stored_article = self.__article_id_index.get(article.article_id)
+                if article.push_count is None and stored_article is not None:
+                    article.push_count = stored_article.push_count
+            self.update(result)
+
     # return article as dataframe
     def get_article_dataframe(self) -> pd.DataFrame:
-        article_field = self.__article_list[0].article_field
-        df_article = pd.DataFrame(data=self.get_article_list(), columns=article_field)
+        df_article = pd.DataFrame(data=self.get_article_list(), columns=Article.article_field)
         return df_article
 
     # return comment as dataframe
     def get_comment_dataframe(self) -> pd.DataFrame:
-        comment_field = self.__comment_list[0].comment_field
+        comment_field = Comment.comment_field
         df_comment = pd.DataFrame(data=self.get_comment_list(), columns=comment_field)
         return df_comment
 
@@ -79,13 +305,27 @@ class PTTData:
             comment_dict.append(comment.to_dict())
         return comment_dict
 
-    # update self's data by another PTTData
+    # record url which couldn't be fetched
+    def add_failure(self, url: str, error: Exception | str) -> None:
+        self.__failure_dict[url] = str(error) or type(error).__name__
+
+    # get failed url and its error message
+    def get_failure(self) -> dict[str, str]:
+        return self.__failure_dict
+
+    # update self's data by another PTTData, articles and comments already stored are upserted
     def update(self, ptt_data: "PTTData") -> None:
+        # comments of articles are upserted with them, so comments of an article which isn't kept are dropped
+        article_ids = set()
         for article in ptt_data.get_article():
+            article_ids.add(article.article_id)
             self.append(article)
 
         for comment in ptt_data.get_comment():
-            self.append(comment)
+            if comment.article_id not in article_ids:
+                self.append(comment)
+
+        self.__failure_dict.update(ptt_data.get_failure())
 
     # return last element in article list
     def get_last_article(self) -> Article:
@@ -101,27 +341,17 @@ class PTTData:
 
     # return all article date
     def get_date_from_article(self) -> list[datetime]:
-        date_list = list()
-        for article in self.__article_list:
-            date = article.post_time.replace(hour=0, minute=0, second=0, microsecond=0)
-            if date not in date_list:
-                date_list.append(date)
-        return date_list
+        # dict keeps first-seen order with O(1) membership test
+        date_dict = dict.fromkeys(
+            article.post_time.replace(hour=0, minute=0, second=0, microsecond=0) for article in self.__article_list
+        )
+        return list(date_dict)
 
+    # keep only articles (and their comments) posted in time range, sorted by post time
     def delete_data_by_date(self, start_time: datetime, end_time: datetime) -> None:
-        pos = 0
-        while pos < len(self.__article_list):
-            time = self.__article_list[pos].post_time
-            if time < start_time or time > end_time:
-                del self.__article_list[pos]
-            else:
-                pos += 1
-        self.__article_list.sort(key=lambda x: x.post_time)
-
-        del self.__comment_list
-        self.__comment_list = list()
-        for article in self.__article_list:
-            self.__comment_list.extend(article.comment_list)
+        self.__article_list = self.get_article_by_time(start_time, end_time)
+        self.__comment_list = [comment for article in self.__article_list for comment in article.comment_list]
+        self.__rebuild_index()
 
 
 def main():
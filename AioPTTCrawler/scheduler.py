@@ -0,0 +1,151 @@
+import asyncio
+import itertools
+from urllib.parse import urlsplit
+
+from .session import SessionManager
+from .throttle import AIMDController, HostRateLimiter, RetryPolicy
+
+
+class RequestScheduler:
+    # lower value is served first
+    HIGH_PRIORITY: int = 0
+    LOW_PRIORITY: int = 1
+
+    # initial RequestScheduler
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        max_requests: int = 50,
+        rate_limit: float = None,
+        retry_policy: RetryPolicy = None,
+    ) -> None:
+        """
+        One work queue for every HTTP request of a crawl. Index pages and article pages are queued together
+        and served by `max_requests` workers, so the amount of in-flight requests never exceeds the limit.
+        Article pages are queued with higher priority than index pages, so started pages finish before new ones open.
+        Inside the same priority, requests of different groups (boards) are served round-robin,
+        so a small board doesn't wait behind every queued request of a large one.
+        Temporary failures are retried with backoff, and the concurrency shrinks while the server is throttling.
+
+        Parameters:
+        session_manager (SessionManager): shared session used by workers
+        max_requests (int): upper bound of concurrent requests
+        rate_limit (float): requests per second to each host, unlimited if None
+        retry_policy (RetryPolicy): retry and backoff of failed requests, RetryPolicy() if None
+
+        Returns:
+        None
+        """
+        self.session_manager = session_manager
+        self.max_requests = max_requests
+        self.rate_limiter = HostRateLimiter(rate_limit)
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.concurrency = AIMDController(max_requests)
+        # share the metrics of session manager
+        self.metrics = session_manager.metrics
+        self.__counter = itertools.count()
+        # fair queueing: each group's requests are tagged with increasing virtual finish time
+        self.__group_finish: dict[str, int] = dict()
+        self.__virtual_time = 0
+        self.__queue: asyncio.PriorityQueue = None
+        self.__workers: list[asyncio.Task] = list()
+        self.__loop: asyncio.AbstractEventLoop = None
+
+    # amount of requests waiting for a worker
+    @property
+    def queue_depth(self) -> int:
+        return 0 if self.__queue is None else self.__queue.qsize()
+
+    # queue url and wait for its response
+    async def fetch(self, url: str, priority: int = HIGH_PRIORITY, group: str = None) -> str:
+        """
+        Queueing url and waiting until a worker gets its data.
+
+        Parameters:
+        url (str): url where data comes from
+        priority (int): RequestScheduler.HIGH_PRIORITY or RequestScheduler.LOW_PRIORITY
+        group (str): fairness group of request, ex: board's name
+
+        Returns:
+        str: original response text
+        """
+        self.start()
+        future = self.__loop.create_future()
+        # a group joining late starts at current virtual time instead of jumping ahead of everyone
+        finish = max(self.__group_finish.get(group, 0), self.__virtual_time) + 1
+        self.__group_finish[group] = finish
+        # counter keeps FIFO order inside the same priority and finish time
+        self.__queue.put_nowait((priority, finish, next(self.__counter), url, future))
+        self.metrics.set_gauge("queue_depth", self.__queue.qsize())
+        return await future
+
+    # start workers on the running event loop, they stay bound to it until close
+    def start(self) -> None:
+        """
+        Starting workers on the running event loop if they aren't started yet.
+
+        Raises:
+        RuntimeError: workers are bound to another event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self.__loop is loop and self.__workers:
+            return
+        if self.__loop is not None and self.__loop is not loop:
+            raise RuntimeError(
+                "RequestScheduler is bound to another event loop, use one AioPTTCrawler (RequestScheduler) per event loop."
+            )
+        self.__loop = loop
+        self.__queue = asyncio.PriorityQueue()
+        self.__workers = [loop.create_task(self.__worker()) for _ in range(self.max_requests)]
+
+    # take request from queue and fetch it
+    async def __worker(self) -> None:
+        while True:
+            _, finish, _, url, future = await self.__queue.get()
+            self.__virtual_time = max(self.__virtual_time, finish)
+            self.metrics.set_gauge("queue_depth", self.__queue.qsize())
+            # requester is gone, skip it
+            if future.done():
+                continue
+            try:
+                result = await self.__fetch_with_retry(url)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    # fetch url under rate limit and concurrency limit, retry temporary failures
+    async def __fetch_with_retry(self, url: str) -> str:
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(host)
+            window = await self.concurrency.acquire()
+            try:
+                result = await self.session_manager.fetch(url)
+            except Exception as e:
+                retryable = self.retry_policy.is_retryable(e)
+                await self.concurrency.release(not retryable, window)
+                self.metrics.set_gauge("concurrency_limit", self.concurrency.limit)
+                if not retryable or attempt >= self.retry_policy.max_retries:
+                    self.metrics.increase("dropped_urls_total")
+                    raise
+                self.metrics.increase("retries_total")
+                await asyncio.sleep(self.retry_policy.get_delay(attempt, e))
+                attempt += 1
+            else:
+                await self.concurrency.release(True, window)
+                return result
+
+    # stop all workers
+    async def close(self) -> None:
+        for worker in self.__workers:
+            worker.cancel()
+        await asyncio.gather(*self.__workers, return_exceptions=True)
+        self.__workers = list()
+        self.__queue = None
+        self.__loop = None
+        self.__group_finish = dict()
+        self.__virtual_time = 0
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import aiohttp
+
+from .cache import ResponseCache
+from .metrics import CrawlMetrics
+from .throttle import RetryPolicy
+
+
+class SessionManager:
+    COOKIES: dict[str:str] = {"over18": "1"}
+
+    # initial SessionManager
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 50,
+        keepalive_timeout: float = 30,
+        ttl_dns_cache: int = 300,
+        cache: ResponseCache = None,
+        request_timeout: float = 30,
+        metrics: CrawlMetrics = None,
+    ) -> None:
+        """
+        Crawl-scoped owner of one pooled aiohttp session.
+
+        Parameters:
+        limit (int): total amount of connections in the pool
+        limit_per_host (int): amount of connections to the same host
+        keepalive_timeout (float): seconds to keep an idle connection alive
+        ttl_dns_cache (int): seconds to cache DNS lookups
+        cache (ResponseCache): response cache, disabled if None
+        request_timeout (float): seconds before a request is given up
+        metrics (CrawlMetrics): where fetch latency and downloaded bytes are recorded, CrawlMetrics() if None
+
+        Returns:
+        None
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.cache = cache
+        self.request_timeout = request_timeout
+        self.metrics = metrics if metrics is not None else CrawlMetrics()
+        self.__session: aiohttp.ClientSession = None
+        self.__loop: asyncio.AbstractEventLoop = None
+
+    # get shared session, create it if it doesn't exist
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Getting the shared session, a new one is created when there is no session yet or it has been closed.
+        The session is bound to the event loop it's created on until close() is awaited.
+
+        Parameters:
+        None
+
+        Returns:
+        aiohttp.ClientSession
+
+        Raises:
+        RuntimeError: session is bound to another event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self.__loop is not None and self.__loop is not loop:
+            raise RuntimeError(
+                "SessionManager is bound to another event loop, use one AioPTTCrawler (SessionManager) per event loop."
+            )
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+            )
+            self.__session = aiohttp.ClientSession(
+                connector=connector,
+                cookies=SessionManager.COOKIES,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+            self.__loop = loop
+        return self.__session
+
+    # get original data from url
+    async def fetch(self, url: str) -> str:
+        """
+        Getting data from url with the shared session.
+        With a response cache, fresh responses are served from it and stale ones are revalidated by conditional request.
+
+        Parameters:
+        url (str): url where data comes from
+
+        Returns:
+        str: original response text
+
+        Raises:
+        LookupError: cache is offline and has no response of url
+        aiohttp.ClientResponseError: server is throttling (429) or failing (5xx)
+        """
+        entry = None
+        if self.cache is not None:
+            entry = self.cache.get(url)
+            if entry is not None and self.cache.is_fresh(url, entry):
+                self.metrics.increase("cache_hits_total")
+                return entry.body
+            if self.cache.offline:
+                raise LookupError(f"Can't find {url} in response cache while offline.")
+
+        session = self.get_session()
+        headers = self.cache.get_conditional_headers(entry) if self.cache is not None else None
+        start_time = time.perf_counter()
+        self.metrics.increase("requests_total")
+        try:
+            async with session.get(url=url, headers=headers) as response:
+                # not modified since cached
+                if response.status == 304 and entry is not None:
+                    self.cache.touch(url)
+                    self.metrics.increase("cache_hits_total")
+                    return entry.body
+                # let the scheduler retry throttled and failed requests
+                if response.status in RetryPolicy.RETRY_STATUS:
+                    response.raise_for_status()
+                body = await response.read()
+                self.metrics.increase("bytes_downloaded_total", len(body))
+                html = body.decode("utf-8")
+                if self.cache is not None and response.status == 200:
+                    self.cache.put(url, html, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                return html
+        except Exception:
+            self.metrics.increase("request_errors_total")
+            raise
+        finally:
+            self.metrics.observe("fetch_seconds", time.perf_counter() - start_time)
+
+    # close shared session
+    async def close(self) -> None:
+        if self.__session is not None and not self.__session.closed:
+            await self.__session.close()
+        self.__session = None
+        self.__loop = None
+
+    async def __aenter__(self) -> "SessionManager":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
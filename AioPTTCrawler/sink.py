@@ -0,0 +1,229 @@
+import json
+import sqlite3
+
+from .model import Article, Comment
+
+
+class Sink:
+    # initial Sink
+    def __init__(self, batch_size: int = 1000) -> None:
+        """
+        Base of incremental writers. Articles are buffered with their comments
+        and written in batches of `batch_size` articles, so a crawl never has to be held in memory.
+        Subclasses implement _write_batch.
+
+        Parameters:
+        batch_size (int): amount of articles per batch
+
+        Returns:
+        None
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}.")
+        self.batch_size = batch_size
+        self.article_count = 0
+        self.comment_count = 0
+        self.__article_rows: list[list] = list()
+        self.__comment_rows: list[list] = list()
+
+    # buffer article and its comments, write them when the batch is full
+    def write(self, article: Article) -> None:
+        self.__article_rows.append(article.to_list())
+        self.__comment_rows.extend(comment.to_list() for comment in article.comment_list)
+        if len(self.__article_rows) >= self.batch_size:
+            self.flush()
+
+    # write buffered rows
+    def flush(self) -> None:
+        if not self.__article_rows and not self.__comment_rows:
+            return
+        article_rows, comment_rows = self.__article_rows, self.__comment_rows
+        self.__article_rows, self.__comment_rows = list(), list()
+        self._write_batch(article_rows, comment_rows)
+        self.article_count += len(article_rows)
+        self.comment_count += len(comment_rows)
+
+    def _write_batch(self, article_rows: list[list], comment_rows: list[list]) -> None:
+        """
+        Parameters:
+        article_rows (list[list]): rows in Article.article_field's order
+        comment_rows (list[list]): rows in Comment.comment_field's order
+
+        Returns:
+        None
+        """
+        raise NotImplementedError
+
+    # flush and release resources
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class JSONLSink(Sink):
+    # initial JSONLSink
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        """
+        Newline-delimited JSON, one article (with its comment_list) per line. Datetimes are written in ISO format.
+
+        Parameters:
+        path (str): output file, appended if it exists
+        batch_size (int): amount of articles per write
+
+        Returns:
+        None
+        """
+        super().__init__(batch_size)
+        self.path = path
+        self.__file = open(path, "a", encoding="utf-8")
+
+    def _write_batch(self, article_rows: list[list], comment_rows: list[list]) -> None:
+        comment_dict: dict[str, list[dict]] = dict()
+        for row in comment_rows:
+            comment_dict.setdefault(row[0], list()).append(JSONLSink.__to_dict(Comment.comment_field, row))
+        lines = list()
+        for row in article_rows:
+            article = JSONLSink.__to_dict(Article.article_field, row)
+            article["comment_list"] = comment_dict.get(row[0], list())
+            lines.append(json.dumps(article, ensure_ascii=False))
+        self.__file.write("\n".join(lines) + "\n")
+        self.__file.flush()
+
+    @staticmethod
+    def __to_dict(fields: list[str], row: list) -> dict:
+        return {name: value.isoformat() if hasattr(value, "isoformat") else value for name, value in zip(fields, row)}
+
+    def close(self) -> None:
+        super().close()
+        self.__file.close()
+
+
+class SQLiteSink(Sink):
+    ARTICLE_INSERT: str = (
+        f"INSERT OR REPLACE INTO article ({', '.join(Article.article_field)}) "
+        f"VALUES ({', '.join('?' * len(Article.article_field))})"
+    )
+
+    # initial SQLiteSink
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        """
+        SQLite tables `article` keyed by article_id and `comment` keyed by (article_id, comment_order).
+        Article's comment_summary is stored as JSON text.
+        Each batch is one transaction of executemany inserts, rows already stored are replaced.
+
+        Parameters:
+        path (str): SQLite file path
+        batch_size (int): amount of articles per transaction
+
+        Returns:
+        None
+        """
+        super().__init__(batch_size)
+        self.path = path
+        self.__connection = sqlite3.connect(path)
+        with self.__connection:
+            self.__connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS article (
+                    article_id TEXT PRIMARY KEY,
+                    article_title TEXT,
+                    user_id TEXT,
+                    user_name TEXT,
+                    board TEXT,
+                    datetime TEXT,
+                    context TEXT,
+                    ip_address TEXT,
+                    push_count INTEGER,
+                    comment_summary TEXT
+                )
+                """
+            )
+            self.__connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS comment (
+                    article_id TEXT NOT NULL,
+                    tag TEXT,
+                    user_id TEXT,
+                    comment_order INTEGER NOT NULL,
+                    context TEXT,
+                    datetime TEXT,
+                    ip_address TEXT,
+                    PRIMARY KEY (article_id, comment_order)
+                )
+                """
+            )
+
+    def _write_batch(self, article_rows: list[list], comment_rows: list[list]) -> None:
+        with self.__connection:
+            self.__connection.executemany(
+                SQLiteSink.ARTICLE_INSERT,
+                (SQLiteSink.__to_sql_row(row) for row in article_rows),
+            )
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO comment VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (SQLiteSink.__to_sql_row(row) for row in comment_rows),
+            )
+
+    # datetime as ISO format, comment_summary as JSON
+    @staticmethod
+    def __to_sql_row(row: list) -> list:
+        return [
+            value.isoformat() if hasattr(value, "isoformat") else json.dumps(value, ensure_ascii=False) if isinstance(value, dict) else value
+            for value in row
+        ]
+
+    def close(self) -> None:
+        super().close()
+        self.__connection.close()
+
+
+class ParquetSink(Sink):
+    # initial ParquetSink
+    def __init__(self, article_path: str, comment_path: str, batch_size: int = 10000) -> None:
+        """
+        Two Parquet files of articles and comments, each batch is written as one row group.
+        Needs pyarrow, install it by `pip install AioPTTCrawler[arrow]`.
+
+        Parameters:
+        article_path (str): Parquet file of articles
+        comment_path (str): Parquet file of comments, join with articles on article_id
+        batch_size (int): amount of articles per row group
+
+        Returns:
+        None
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("pyarrow is required to write parquet, install it by `pip install AioPTTCrawler[arrow]`.") from e
+
+        super().__init__(batch_size)
+        self.__pa = pa
+        string, timestamp = pa.string(), pa.timestamp("us")
+        article_types = {"datetime": timestamp, "push_count": pa.int32(), "comment_summary": pa.map_(string, pa.int32())}
+        self.__article_schema = pa.schema([(name, article_types.get(name, string)) for name in Article.article_field])
+        comment_types = {"comment_order": pa.int32(), "datetime": timestamp}
+        self.__comment_schema = pa.schema([(name, comment_types.get(name, string)) for name in Comment.comment_field])
+        self.__article_writer = pq.ParquetWriter(article_path, self.__article_schema)
+        self.__comment_writer = pq.ParquetWriter(comment_path, self.__comment_schema)
+
+    def _write_batch(self, article_rows: list[list], comment_rows: list[list]) -> None:
+        for writer, schema, rows in (
+            (self.__article_writer, self.__article_schema, article_rows),
+            (self.__comment_writer, self.__comment_schema, comment_rows),
+        ):
+            if not rows:
+                continue
+            columns = [self.__pa.array(values, type=field.type) for field, values in zip(schema, zip(*rows))]
+            writer.write_table(self.__pa.Table.from_arrays(columns, schema=schema))
+
+    def close(self) -> None:
+        super().close()
+        self.__article_writer.close()
+        self.__comment_writer.close()
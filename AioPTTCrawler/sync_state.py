@@ -0,0 +1,70 @@
+import json
+import os
+
+from .model import IndexEntry
+
+
+class BoardSyncState:
+    # initial BoardSyncState
+    def __init__(self, path: str = None) -> None:
+        """
+        Last known push count of every article seen by board sync, kept per board.
+
+        Parameters:
+        path (str): JSON file to load and save state, state is kept in memory only if None
+
+        Returns:
+        None
+        """
+        self.path = path
+        self.__push_counts: dict[str, dict[str, int]] = dict()
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                self.__push_counts = json.load(file)
+
+    # pick entries which are new or whose push count changed
+    def get_changed_entries(self, board: str, entries: list[IndexEntry]) -> list[IndexEntry]:
+        """
+        Parameters:
+        board (str): PTT board's name
+        entries (list[IndexEntry]): entries read from board's index pages
+
+        Returns:
+        list[IndexEntry]: entries need to be fetched again
+        """
+        push_counts = self.__push_counts.get(board, dict())
+        return [entry for entry in entries if push_counts.get(entry.article_id) != entry.push_count]
+
+    # remember push count of entries
+    def update(
+        self, board: str, entries: list[IndexEntry], failed_article_ids: set[str] = frozenset(), partial: bool = False
+    ) -> None:
+        """
+        Replacing board's state by entries of the latest sync, so the state only covers the synced pages.
+        Failed articles keep their previous push count and will be fetched again next time.
+
+        Parameters:
+        board (str): PTT board's name
+        entries (list[IndexEntry]): all entries of the synced pages
+        failed_article_ids (set[str]): id of articles which couldn't be fetched
+        partial (bool): some index pages couldn't be read, previous state is kept for articles not in entries
+
+        Returns:
+        None
+        """
+        previous_push_counts = self.__push_counts.get(board, dict())
+        push_counts = dict(previous_push_counts) if partial else dict()
+        for entry in entries:
+            if entry.article_id in failed_article_ids:
+                if entry.article_id in previous_push_counts:
+                    push_counts[entry.article_id] = previous_push_counts[entry.article_id]
+            else:
+                push_counts[entry.article_id] = entry.push_count
+        self.__push_counts[board] = push_counts
+
+    # write state into file
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(self.__push_counts, file, ensure_ascii=False)
@@ -0,0 +1,185 @@
+import asyncio
+import random
+import time
+
+import aiohttp
+
+
+class TokenBucket:
+    # initial TokenBucket
+    def __init__(self, rate: float, burst: int = None) -> None:
+        """
+        Rate limiter allowing `rate` requests per second on average and `burst` requests at once.
+
+        Parameters:
+        rate (float): tokens added per second
+        burst (int): bucket size, same as rate if None
+
+        Returns:
+        None
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.__tokens = float(self.burst)
+        self.__updated_time = time.monotonic()
+        self.__lock: asyncio.Lock = None
+        self.__loop: asyncio.AbstractEventLoop = None
+
+    # asyncio.Lock is bound to the loop it's first used on, create one per running loop
+    def __get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self.__lock is None or self.__loop is not loop:
+            self.__lock = asyncio.Lock()
+            self.__loop = loop
+        return self.__lock
+
+    # wait until a token is available
+    async def acquire(self) -> None:
+        async with self.__get_lock():
+            while True:
+                now = time.monotonic()
+                self.__tokens = min(self.burst, self.__tokens + (now - self.__updated_time) * self.rate)
+                self.__updated_time = now
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.__tokens) / self.rate)
+
+
+class HostRateLimiter:
+    # initial HostRateLimiter
+    def __init__(self, rate: float = None, burst: int = None) -> None:
+        """
+        One TokenBucket per host.
+
+        Parameters:
+        rate (float): requests per second to each host, unlimited if None
+        burst (int): requests allowed at once to each host
+
+        Returns:
+        None
+        """
+        self.rate = rate
+        self.burst = burst
+        self.__buckets: dict[str, TokenBucket] = dict()
+
+    async def acquire(self, host: str) -> None:
+        if self.rate is None:
+            return
+        bucket = self.__buckets.get(host)
+        if bucket is None:
+            bucket = self.__buckets[host] = TokenBucket(self.rate, self.burst)
+        await bucket.acquire()
+
+
+class AIMDController:
+    # initial AIMDController
+    def __init__(self, maximum: int, minimum: int = 1, increase: float = 1, decrease: float = 0.5) -> None:
+        """
+        Concurrency limit controlled by additive increase / multiplicative decrease:
+        every successful request raises the limit by `increase / limit`, so it grows by `increase` per round trip,
+        and a throttled or failed request multiplies it by `decrease`. The limit is decreased once per congestion event,
+        failures of requests started before the last decrease are ignored.
+
+        Parameters:
+        maximum (int): upper bound of the limit, also the initial limit
+        minimum (int): lower bound of the limit
+        increase (float): limit added per round of successful requests
+        decrease (float): factor applied to limit on failure
+
+        Returns:
+        None
+        """
+        self.maximum = maximum
+        self.minimum = minimum
+        self.increase = increase
+        self.decrease = decrease
+        self.limit = float(maximum)
+        self.in_flight = 0
+        # amount of decreases, requests remember it when they start
+        self.__decrease_count = 0
+        self.__condition: asyncio.Condition = None
+        self.__loop: asyncio.AbstractEventLoop = None
+
+    def __get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self.__condition is None or self.__loop is not loop:
+            self.__condition = asyncio.Condition()
+            self.__loop = loop
+        return self.__condition
+
+    # wait until in-flight requests are under the limit
+    async def acquire(self) -> int:
+        """
+        Returns:
+        int: congestion window the request started in, pass it to release
+        """
+        condition = self.__get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            return self.__decrease_count
+
+    # finish request and adjust the limit
+    async def release(self, success: bool, window: int = None) -> None:
+        """
+        Parameters:
+        success (bool): request succeeded
+        window (int): value returned by acquire, failures of older windows don't decrease the limit again
+
+        Returns:
+        None
+        """
+        condition = self.__get_condition()
+        async with condition:
+            self.in_flight -= 1
+            if success:
+                self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+            elif window is None or window == self.__decrease_count:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self.__decrease_count += 1
+            condition.notify_all()
+
+
+class RetryPolicy:
+    # HTTP status worth retrying
+    RETRY_STATUS: set[int] = {429, 500, 502, 503, 504}
+
+    # initial RetryPolicy
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 30) -> None:
+        """
+        Retry with exponential backoff and full jitter.
+
+        Parameters:
+        max_retries (int): amount of retries after the first attempt
+        base_delay (float): seconds of the first backoff
+        max_delay (float): upper bound of one backoff
+
+        Returns:
+        None
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    # check if error is temporary
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in RetryPolicy.RETRY_STATUS
+        return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+    # seconds to wait before retry
+    def get_delay(self, attempt: int, error: Exception = None) -> float:
+        """
+        Parameters:
+        attempt (int): 0 for the first retry
+        error (Exception): error of last attempt, its Retry-After header is honoured
+
+        Returns:
+        float
+        """
+        if isinstance(error, aiohttp.ClientResponseError) and error.headers is not None:
+            retry_after = error.headers.get("Retry-After")
+            if retry_after is not None and retry_after.isdigit():
+                return min(self.max_delay, float(retry_after))
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
@@ -0,0 +1,131 @@
+import argparse
+import json
+import time
+from datetime import timedelta
+
+from AioPTTCrawler import AioPTTCrawler
+from AioPTTCrawler.parser import ARTICLE_PARSERS
+
+from .pages import BOARD_START
+from .parser_benchmark import build_pages, measure
+from .server import get_free_port, start_server_process
+
+# End-to-end benchmark of the crawler against a local stand-in of www.ptt.cc, no network needed.
+# usage: python -m benchmark.crawl_benchmark [--pages 20] [--latency 0.05] [--error-rate 0.01] [--output result.json]
+
+BOARD: str = "Gossiping"
+
+
+# crawl pages and return used time with the crawled data
+def measure_board_articles(ptt_crawler: AioPTTCrawler, start_index: int, end_index: int, columnar: bool = False):
+    start = time.perf_counter()
+    ptt_data = ptt_crawler.get_board_articles(BOARD, start_index, end_index, show_progress=False, columnar=columnar)
+    return time.perf_counter() - start, ptt_data
+
+
+# best time of exporting article and comment dataframes
+def measure_dataframe(ptt_data, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ptt_data.get_article_dataframe()
+        ptt_data.get_comment_dataframe()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark crawling against a local stand-in server.")
+    argument_parser.add_argument("--pages", type=int, default=20, help="amount of index pages crawled by get_board_articles")
+    argument_parser.add_argument("--latest-index", type=int, default=1000, help="latest page number of the stand-in board")
+    argument_parser.add_argument("--push-counts", default="0,30,100,500", help="push counts of articles")
+    argument_parser.add_argument("--latency", type=float, default=0.02, help="seconds before each response")
+    argument_parser.add_argument("--error-rate", type=float, default=0, help="ratio of 503 responses")
+    argument_parser.add_argument("--recorded-pages", help="directory of recorded pages served instead of synthetic ones")
+    argument_parser.add_argument("--max-requests", type=int, default=50)
+    argument_parser.add_argument("--parser-workers", type=int, default=0)
+    argument_parser.add_argument("--parser-engine", default="xpath", choices=list(ARTICLE_PARSERS))
+    argument_parser.add_argument("--repeat", type=int, default=3, help="repeat of parser and dataframe benchmarks")
+    argument_parser.add_argument("--output", help="write results as json, to compare runs")
+    args = argument_parser.parse_args()
+    push_counts = [int(push_count) for push_count in args.push_counts.split(",")]
+
+    port = get_free_port()
+    server = start_server_process(
+        port,
+        latest_index=args.latest_index,
+        push_counts=push_counts,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        pages_dir=args.recorded_pages,
+    )
+    results = dict()
+    try:
+        ptt_crawler = AioPTTCrawler(
+            ptt_url=f"http://127.0.0.1:{port}",
+            max_requests=args.max_requests,
+            parser_workers=args.parser_workers,
+            parser_engine=args.parser_engine,
+        )
+        end_index = args.latest_index
+        start_index = max(1, end_index - args.pages + 1)
+
+        # part 1. get_board_articles
+        used_time, ptt_data = measure_board_articles(ptt_crawler, start_index, end_index)
+        article_count = len(ptt_data.get_article())
+        results["get_board_articles"] = {
+            "seconds": used_time,
+            "pages_per_second": (end_index - start_index + 1) / used_time,
+            "articles_per_second": article_count / used_time,
+            "articles": article_count,
+            "failures": len(ptt_data.get_failure()),
+        }
+        columnar_time, columnar_data = measure_board_articles(ptt_crawler, start_index, end_index, columnar=True)
+        results["get_board_articles_columnar"] = {
+            "seconds": columnar_time,
+            "articles_per_second": columnar_data.get_article_count() / columnar_time,
+        }
+
+        # part 2. get_article_by_datetime, one day in the middle of the board
+        target_date = (BOARD_START + timedelta(hours=args.latest_index // 2)).replace(tzinfo=None)
+        start = time.perf_counter()
+        date_data = ptt_crawler.get_article_by_datetime(BOARD, target_date, target_date)
+        used_time = time.perf_counter() - start
+        results["get_article_by_datetime"] = {"seconds": used_time, "articles": len(date_data.get_article())}
+        results["metrics"] = ptt_crawler.metrics.snapshot()["counters"]
+        ptt_crawler.close()
+    finally:
+        server.terminate()
+        server.join()
+
+    # part 3. parser alone
+    pages = build_pages(push_counts)
+    results["parser"] = {name: measure(parser, pages, args.repeat) for name, parser in ARTICLE_PARSERS.items()}
+
+    # part 4. dataframe export
+    results["dataframe"] = {
+        "PTTData": measure_dataframe(ptt_data, args.repeat),
+        "ColumnarPTTData": measure_dataframe(columnar_data, args.repeat),
+    }
+
+    board_result = results["get_board_articles"]
+    print(
+        f"get_board_articles: {board_result['articles']} articles in {board_result['seconds']:.2f} s, "
+        f"{board_result['pages_per_second']:.1f} pages/s, {board_result['articles_per_second']:.1f} articles/s, "
+        f"{board_result['failures']} failures"
+    )
+    print(f"get_board_articles(columnar=True): {results['get_board_articles_columnar']['seconds']:.2f} s")
+    date_result = results["get_article_by_datetime"]
+    print(f"get_article_by_datetime: {date_result['articles']} articles in {date_result['seconds']:.2f} s")
+    for name, used_time in results["parser"].items():
+        print(f"parser {name:>12}: {used_time * 1000:.1f} ms for {len(pages)} articles")
+    for name, used_time in results["dataframe"].items():
+        print(f"dataframe {name:>15}: {used_time * 1000:.1f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import random
+import re
+import time
+from datetime import datetime, timedelta
+
+from AioPTTCrawler.decoder import decode_ip, decode_post_time, decode_push_datetime
+
+# Compare push time/IP decoding against the strptime based implementation it replaced.
+# usage: python -m benchmark.decoder_benchmark [--pushes N]
+
+
+# decode push by strptime and string patterns
+def decode_push_by_strptime(text: str, post_time: datetime) -> tuple[datetime, str]:
+    text = re.sub("[\n]", "", text)
+    push_ip = re.search(r"(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})", text)
+    try:
+        push_time = datetime.strptime(str(post_time.year) + "/" + re.search(r"(\d{,2}/\d{,2} \d{,2}:\d{,2})", text).group(1), "%Y/%m/%d %H:%M")
+    except (AttributeError, ValueError):
+        push_time = None
+    return push_time, push_ip.group(1) if push_ip else None
+
+
+# decode push by decoder
+def decode_push(text: str, post_time: datetime) -> tuple[datetime, str]:
+    text = text.replace("\n", "")
+    return decode_push_datetime(text, post_time), decode_ip(text)
+
+
+# pushes of one popular article, a few pushes per minute
+def build_pushes(push_count: int, post_time: datetime) -> list[str]:
+    rand = random.Random(0)
+    pushes = list()
+    for order in range(push_count):
+        push_time = post_time + timedelta(seconds=order * 15)
+        pushes.append(f" {rand.randrange(1, 255)}.{rand.randrange(256)}.{rand.randrange(256)}.{rand.randrange(256)} {push_time:%m/%d %H:%M}\n")
+    return pushes
+
+
+def measure(decoder, pushes: list[str], post_time: datetime, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for push in pushes:
+            decoder(push, post_time)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Compare push decoding implementations.")
+    argument_parser.add_argument("--pushes", type=int, default=5000)
+    argument_parser.add_argument("--repeat", type=int, default=5)
+    args = argument_parser.parse_args()
+
+    post_time = datetime(2022, 9, 14, 16, 41, 58)
+    pushes = build_pushes(args.pushes, post_time)
+    for push in pushes:
+        if decode_push(push, post_time) != decode_push_by_strptime(push, post_time):
+            raise SystemExit(f"different result: {push!r}")
+
+    post_time_text = "Wed Sep 14 16:41:58 2022"
+    if decode_post_time(post_time_text) != datetime.strptime(post_time_text, "%a %b %d %H:%M:%S %Y"):
+        raise SystemExit(f"different result: {post_time_text!r}")
+
+    print(f"{args.pushes} pushes, equal output")
+    print(f"  strptime: {measure(decode_push_by_strptime, pushes, post_time, args.repeat) * 1000:.1f} ms")
+    print(f"   decoder: {measure(decode_push, pushes, post_time, args.repeat) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+# Synthetic PTT pages following www.ptt.cc's markup, used by the benchmarks.
+
+PTT_TIMEZONE: timezone = timezone(timedelta(hours=8))
+BOARD_START: datetime = datetime(2022, 1, 1, tzinfo=PTT_TIMEZONE)
+PUSH_TAGS: list[str] = ["推 ", "噓 ", "→ "]
+
+
+# article id of the n-th article on page
+def get_article_id(page_number: int, order: int) -> str:
+    post_time = BOARD_START + timedelta(hours=page_number, minutes=order * 2)
+    return f"M.{int(post_time.timestamp())}.A.{(page_number * 31 + order) % 4096:03X}"
+
+
+# board's index page
+def get_index_page(board: str, page_number: int, latest_index: int, articles_per_page: int = 20, push_count: int = 30) -> str:
+    """
+    Build board's index page. The 6th entry of each page is a deleted article,
+    and the latest page ends with two on-top articles.
+
+    Parameters:
+    board (str): PTT board's name
+    page_number (int): page number
+    latest_index (int): latest page number of the board
+    articles_per_page (int): amount of entries on the page
+    push_count (int): push count shown in listing
+
+    Returns:
+    str: html
+    """
+    entries = list()
+    for order in range(articles_per_page):
+        post_time = BOARD_START + timedelta(hours=page_number, minutes=order * 2)
+        date = f"{post_time.month:>2}/{post_time.day:02}"
+        if order == 5:
+            entries.append(
+                '<div class="r-ent"><div class="nrec"></div><div class="title">\n(本文已被刪除) [someone]\n</div>'
+                f'<div class="meta"><div class="author">-</div><div class="article-menu"></div><div class="date">{date}</div><div class="mark"></div></div></div>'
+            )
+            continue
+        article_id = get_article_id(page_number, order)
+        nrec = push_count if push_count < 100 else "爆"
+        entries.append(
+            f'<div class="r-ent"><div class="nrec"><span class="hl f2">{nrec}</span></div>'
+            f'<div class="title"><a href="/bbs/{board}/{article_id}.html">[問卦] title {page_number}-{order}</a></div>'
+            f'<div class="meta"><div class="author">user{order}</div><div class="article-menu"></div><div class="date">{date}</div><div class="mark"></div></div></div>'
+        )
+    if page_number == latest_index:
+        entries.append('<div class="r-list-sep"></div>')
+        for order in range(2):
+            entries.append(
+                f'<div class="r-ent"><div class="nrec"></div><div class="title"><a href="/bbs/{board}/M.1600000000.A.00{order}.html">[公告] on top</a></div>'
+                '<div class="meta"><div class="author">admin</div><div class="article-menu"></div><div class="date"> 1/01</div><div class="mark"></div></div></div>'
+            )
+    previous_page = f'<a class="btn wide" href="/bbs/{board}/index{page_number - 1}.html">&lsaquo; 上頁</a>'
+    return (
+        '<html><body><div id="main-container">'
+        f'<div id="action-bar-container"><div class="btn-group btn-group-paging">{previous_page}</div></div>'
+        f'<div class="r-list-container action-bar-margin bbs-screen"><div class="search-bar"></div>{"".join(entries)}</div>'
+        "</div></body></html>"
+    )
+
+
+# article page
+def get_article_page(board: str, article_id: str, push_count: int = 30, reply: bool = False) -> str:
+    """
+    Build article page, push tags and push users are picked randomly but reproducibly per article.
+
+    Parameters:
+    board (str): PTT board's name
+    article_id (str): PTT article id
+    push_count (int): amount of pushes
+    reply (bool): quote another article like "Re:" articles do
+
+    Returns:
+    str: html
+    """
+    post_time = datetime.fromtimestamp(int(article_id.split(".")[1]), PTT_TIMEZONE)
+    post_time_text = f"{post_time:%a %b} {post_time.day:>2} {post_time:%H:%M:%S %Y}"
+    rand = random.Random(article_id)
+    pushes = list()
+    for order in range(push_count):
+        push_time = post_time + timedelta(minutes=order)
+        pushes.append(
+            f'<div class="push"><span class="hl push-tag">{rand.choice(PUSH_TAGS)}</span>'
+            f'<span class="f3 hl push-userid">pusher{rand.randrange(1000)}</span>'
+            f'<span class="f3 push-content">: content {order}</span>'
+            f'<span class="push-ipdatetime"> 1.2.{order % 256}.{rand.randrange(256)} {push_time:%m/%d %H:%M}\n</span></div>'
+        )
+    quote = '<span class="f2">※ 引述《someone (某人)》之銘言：\n</span><span class="f6">: quoted line\n</span>' if reply else ""
+    return (
+        '<html><body><div id="main-container"><div id="main-content" class="bbs-screen bbs-content">'
+        '<div class="article-metaline"><span class="article-meta-tag">作者</span><span class="article-meta-value">author1 (暱稱)</span></div>'
+        f'<div class="article-metaline-right"><span class="article-meta-tag">看板</span><span class="article-meta-value">{board}</span></div>'
+        '<div class="article-metaline"><span class="article-meta-tag">標題</span><span class="article-meta-value">[問卦] title</span></div>'
+        f'<div class="article-metaline"><span class="article-meta-tag">時間</span><span class="article-meta-value">{post_time_text}</span></div>'
+        f"{quote}body line one\n"
+        '<a href="https://example.com" target="_blank" rel="noreferrer noopener nofollow">https://example.com</a>\n'
+        "body line two\n\n--\n"
+        '<span class="f2">※ 發信站: 批踢踢實業坊(ptt.cc), 來自: 59.120.192.119 (臺灣)\n</span>'
+        f'<span class="f2">※ 文章網址: <a href="https://www.ptt.cc/bbs/{board}/{article_id}.html">https://www.ptt.cc/bbs/{board}/{article_id}.html</a>\n</span>'
+        f'{"".join(pushes)}</div></div></body></html>'
+    )
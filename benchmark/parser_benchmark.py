@@ -0,0 +1,94 @@
+import argparse
+import os
+import time
+
+from AioPTTCrawler.parser import ARTICLE_PARSERS
+
+from .pages import get_article_id, get_article_page
+
+# Compare article parser engines on saved or synthetic pages.
+# usage: python -m benchmark.parser_benchmark [--pages DIR] [--repeat N]
+
+
+# load pages as (article_id, html)
+def load_pages(directory: str) -> list[tuple[str, str]]:
+    """
+    Load saved article pages, file name is the article id. ex: M.1663144920.A.A6E.html
+
+    Parameters:
+    directory (str): directory of saved pages
+
+    Returns:
+    list[tuple[str, str]]: article id and html
+    """
+    pages = list()
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(".html"):
+            with open(os.path.join(directory, file_name), "r", encoding="utf-8") as file:
+                pages.append((file_name[: -len(".html")], file.read()))
+    return pages
+
+
+# build synthetic pages with different amount of pushes
+def build_pages(push_counts: list[int]) -> list[tuple[str, str]]:
+    pages = list()
+    for order, push_count in enumerate(push_counts):
+        article_id = get_article_id(1, order)
+        pages.append((article_id, get_article_page("Gossiping", article_id, push_count, reply=order % 2 == 1)))
+    # IP in body before the "※ 發信站" line
+    article_id = get_article_id(1, len(push_counts))
+    html = get_article_page("Gossiping", article_id, 10).replace("body line one", "body line one 10.0.0.1")
+    pages.append((article_id, html))
+    return pages
+
+
+# check every engine returns the same records
+def check_equal_output(pages: list[tuple[str, str]]) -> list[str]:
+    mismatches = list()
+    for article_id, html in pages:
+        records = {name: parser(html, article_id) for name, parser in ARTICLE_PARSERS.items()}
+        baseline = records["xpath"]
+        for name, record in records.items():
+            if record != baseline:
+                mismatches.append(f"{article_id}: {name} differs from xpath")
+    return mismatches
+
+
+# best time of parsing all pages with one engine
+def measure(parser, pages: list[tuple[str, str]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for article_id, html in pages:
+            parser(html, article_id)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Compare article parser engines.")
+    argument_parser.add_argument("--pages", help="directory of saved article pages, synthetic pages are used if omitted")
+    argument_parser.add_argument("--push-counts", default="0,100,1000,3000", help="push counts of synthetic pages")
+    argument_parser.add_argument("--repeat", type=int, default=5)
+    args = argument_parser.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages)
+    else:
+        pages = build_pages([int(push_count) for push_count in args.push_counts.split(",")])
+
+    mismatches = check_equal_output(pages)
+    for mismatch in mismatches:
+        print(mismatch)
+    print(f"{len(pages)} pages, {'equal output' if not mismatches else f'{len(mismatches)} mismatches'}")
+
+    for name, parser in ARTICLE_PARSERS.items():
+        used_time = measure(parser, pages, args.repeat)
+        print(f"{name:>12}: {used_time * 1000:.1f} ms")
+
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
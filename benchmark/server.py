@@ -0,0 +1,162 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import re
+import socket
+import time
+from functools import lru_cache
+
+from aiohttp import web
+
+from .pages import get_article_page, get_index_page
+
+# Local stand-in of www.ptt.cc serving synthetic or recorded pages, used by the crawl benchmark.
+# usage: python -m benchmark.server [--port 8080] [--latest-index 1000] [--latency 0.05] [--error-rate 0.01]
+
+INDEX_PAGE_PATTERN: re.Pattern = re.compile(r"index(\d*)")
+
+
+class StandInServer:
+    # initial StandInServer
+    def __init__(
+        self,
+        latest_index: int = 1000,
+        articles_per_page: int = 20,
+        push_counts: list[int] = None,
+        latency: float = 0,
+        error_rate: float = 0,
+        pages_dir: str = None,
+        seed: int = 0,
+    ) -> None:
+        """
+        Serving /bbs/{board}/index{n}.html and /bbs/{board}/{article_id}.html like www.ptt.cc.
+
+        Parameters:
+        latest_index (int): latest page number of every board
+        articles_per_page (int): amount of entries on each index page
+        push_counts (list[int]): push count of each article is picked from it, [30] if None
+        latency (float): seconds to wait before each response
+        error_rate (float): ratio of responses answered with 503
+        pages_dir (str): directory of recorded pages named as url's file name (ex: M.1663144920.A.A6E.html),
+        they are served instead of synthetic pages
+        seed (int): seed of error injection
+
+        Returns:
+        None
+        """
+        self.latest_index = latest_index
+        self.articles_per_page = articles_per_page
+        self.push_counts = push_counts if push_counts else [30]
+        self.latency = latency
+        self.error_rate = error_rate
+        self.pages_dir = pages_dir
+        self.request_count = 0
+        self.__random = random.Random(seed)
+        # pages are generated once, so the server costs little time of the benchmark
+        self.__get_index_page = lru_cache(maxsize=None)(get_index_page)
+        self.__get_article_page = lru_cache(maxsize=None)(get_article_page)
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/bbs/{board}/{name}.html", self.handle_page)
+        return app
+
+    async def handle_page(self, request: web.Request) -> web.Response:
+        self.request_count += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        if self.error_rate > 0 and self.__random.random() < self.error_rate:
+            return web.Response(status=503, text="Service Unavailable")
+
+        board = request.match_info["board"]
+        name = request.match_info["name"]
+        html = self.__get_recorded_page(name)
+        if html is not None:
+            return web.Response(text=html, content_type="text/html")
+
+        matched = INDEX_PAGE_PATTERN.fullmatch(name)
+        if matched is not None:
+            page_number = int(matched.group(1)) if matched.group(1) else self.latest_index
+            if not 1 <= page_number <= self.latest_index:
+                raise web.HTTPNotFound()
+            html = self.__get_index_page(board, page_number, self.latest_index, self.articles_per_page)
+        else:
+            article_random = random.Random(name)
+            push_count = article_random.choice(self.push_counts)
+            html = self.__get_article_page(board, name, push_count, reply=article_random.random() < 0.5)
+        return web.Response(text=html, content_type="text/html")
+
+    def __get_recorded_page(self, name: str) -> str | None:
+        if self.pages_dir is None:
+            return None
+        path = os.path.join(self.pages_dir, f"{name}.html")
+        if not os.path.isfile(path):
+            return None
+        with open(path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    # serve forever
+    def run(self, port: int) -> None:
+        web.run_app(self.create_app(), host="127.0.0.1", port=port, print=None, handle_signals=False)
+
+
+# get a free local port
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# run StandInServer in another process, so it doesn't share the event loop or the GIL with the crawler
+def start_server_process(port: int, timeout: float = 10, **kwargs) -> multiprocessing.Process:
+    """
+    Parameters:
+    port (int): local port to listen on
+    timeout (float): seconds to wait for the server
+    kwargs: arguments of StandInServer
+
+    Returns:
+    multiprocessing.Process: call terminate() to stop the server
+    """
+    process = multiprocessing.Process(target=_run_server, args=(port, kwargs), daemon=True)
+    process.start()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return process
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise TimeoutError(f"Stand-in server didn't start on port {port} in {timeout} seconds.")
+
+
+def _run_server(port: int, kwargs: dict) -> None:
+    StandInServer(**kwargs).run(port)
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Serve synthetic PTT pages.")
+    argument_parser.add_argument("--port", type=int, default=8080)
+    argument_parser.add_argument("--latest-index", type=int, default=1000)
+    argument_parser.add_argument("--push-counts", default="30", help="push counts of articles")
+    argument_parser.add_argument("--latency", type=float, default=0, help="seconds before each response")
+    argument_parser.add_argument("--error-rate", type=float, default=0, help="ratio of 503 responses")
+    argument_parser.add_argument("--pages", help="directory of recorded pages served instead of synthetic ones")
+    args = argument_parser.parse_args()
+
+    server = StandInServer(
+        latest_index=args.latest_index,
+        push_counts=[int(push_count) for push_count in args.push_counts.split(",")],
+        latency=args.latency,
+        error_rate=args.error_rate,
+        pages_dir=args.pages,
+    )
+    print(f"Serving on http://127.0.0.1:{args.port}")
+    server.run(args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,9 +17,11 @@ setup(
     install_requires=[
         'aiohttp>=3.8.3',
         "lxml>=4.9.1",
-        "requests>=2.28.1",
         "pandas>=1.5.0",
     ],
+    extras_require={
+        "arrow": ["pyarrow>=10.0.0"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",